@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Compares ColumnStore range filters with a scan over the objects.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_columnar [number_of_places]
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+from models.engine.columnar import ColumnStore
+
+QUERIES = 100
+FIELDS = ("price_by_night", "max_guest", "latitude", "longitude")
+
+
+def scan(places, max_price, south, north):
+    """Returns the keys matching the query by checking every place"""
+    return [key for key, place in places.items()
+            if place.price_by_night <= max_price and
+            south <= place.latitude <= north]
+
+
+def main(count):
+    """Times both strategies on count random places in the US"""
+    random.seed(0)
+    places = {
+        "Place.{}".format(i): SimpleNamespace(
+            price_by_night=random.randint(20, 500),
+            max_guest=random.randint(1, 10),
+            latitude=random.uniform(25, 49),
+            longitude=random.uniform(-124, -67))
+        for i in range(count)}
+    queries = []
+    for _ in range(QUERIES):
+        south = random.uniform(25, 48)
+        queries.append((random.randint(20, 500), south, south + 1))
+
+    start = time.perf_counter()
+    columns = ColumnStore(FIELDS)
+    for key, place in places.items():
+        columns.add(key, place)
+    columns.filter(price_by_night=(None, 0), latitude=(0, 0))
+    print("columns build   {:>10.2f} s".format(time.perf_counter() - start))
+
+    start = time.perf_counter()
+    found = sum(len(columns.filter(price_by_night=(None, max_price),
+                                   latitude=(south, north)))
+                for max_price, south, north in queries)
+    elapsed = time.perf_counter() - start
+    print("column filter   {:>10.2f} ms/query ({} hits)".format(
+        elapsed * 1000 / QUERIES, found))
+
+    start = time.perf_counter()
+    found = sum(len(scan(places, *query)) for query in queries)
+    elapsed = time.perf_counter() - start
+    print("object scan     {:>10.2f} ms/query ({} hits)".format(
+        elapsed * 1000 / QUERIES, found))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
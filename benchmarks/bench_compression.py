@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Compares the size and the save / load times of a snapshot for every
+serializer format and compression codec.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_compression [number_of_objects]
+"""
+
+import os
+import sys
+import random
+import tempfile
+import time
+from datetime import datetime
+from models.engine import file_storage
+from models.engine.file_storage import FileStorage
+
+FORMATS = ("json", "pickle")
+CODECS = (None, "gzip", "lzma")
+
+
+def make_objects(count):
+    """Returns count serialized Places"""
+    random.seed(0)
+    now = datetime.now().isoformat()
+    objects = {}
+    for i in range(count):
+        obj_id = "{:036d}".format(i)
+        objects["Place." + obj_id] = {
+            "__class__": "Place", "id": obj_id, "created_at": now,
+            "updated_at": now, "city_id": "{:036d}".format(i % 500),
+            "user_id": "{:036d}".format(i % 2000),
+            "name": "Place {}".format(i), "description": "Nice place",
+            "number_rooms": random.randint(1, 6),
+            "number_bathrooms": random.randint(1, 3),
+            "max_guest": random.randint(1, 10),
+            "price_by_night": random.randint(20, 500),
+            "latitude": random.uniform(25, 49),
+            "longitude": random.uniform(-124, -67),
+        }
+    return objects
+
+
+def main(count):
+    """Writes and reads count Places in every format and codec"""
+    objects = make_objects(count)
+    storage = FileStorage()
+    print("{:<8}{:<6}{:>12}{:>10}{:>10}".format(
+        "format", "codec", "size (KB)", "save (s)", "load (s)"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        for serializer in FORMATS:
+            for codec in CODECS:
+                FileStorage.serializer = serializer
+                FileStorage.compression = codec
+                start = time.perf_counter()
+                storage._write_file(path, objects)
+                saved = time.perf_counter()
+                file_storage._parse_shard(path)
+                loaded = time.perf_counter()
+                print("{:<8}{:<6}{:>12,.0f}{:>10.3f}{:>10.3f}".format(
+                    serializer, codec or "-", os.path.getsize(path) / 1024,
+                    saved - start, loaded - saved))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Measures the parsing throughput of dot notation console commands, with
+the former inline regex and json parsing and with parse_dot_command(),
+on repeated and on distinct lines.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_console_parse [number_of_lines]
+"""
+
+import re
+import sys
+import json
+import time
+import uuid
+from console import parse_dot_command
+
+SHAPES = ('User.show("{}")', 'Place.update("{}", "name", "Loft")',
+          'Place.update("{}", {{"max_guest": 4}})', 'User.count()')
+
+
+def legacy_parse(line):
+    """Parses line the way HBNBCommand.default() used to"""
+    match = re.fullmatch(r"(\w+)\.(\w+)\((.*?)\)", line)
+    class_name, command, params = match.groups()
+    if command == "update" and re.fullmatch(r'".*",\s*\{.*\}', params):
+        return re.fullmatch(r'"(.*?)",\s*(\{.*\})', params).groups()
+    return json.loads(f"[{params}]")
+
+
+def rate(parse, lines):
+    """Returns the lines parsed per second, best of a few runs"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for line in lines:
+            parse(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best
+
+
+def main(count):
+    """Parses count lines of each kind with both parsers"""
+    ids = [str(uuid.uuid4()) for _ in range(50)]
+    repeated = [SHAPES[i % len(SHAPES)].format(ids[i % len(ids)])
+                for i in range(count)]
+    distinct = [SHAPES[i % len(SHAPES)].format(uuid.uuid4())
+                for i in range(count)]
+    for name, lines in (("repeated lines", repeated),
+                        ("distinct lines", distinct)):
+        print("{:<16}{:>12,.0f} lines/s (before){:>12,.0f} lines/s (after)"
+              .format(name, rate(legacy_parse, lines),
+                      rate(parse_dot_command, lines)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Compares GridIndex radius queries with a linear scan over all places.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_geo [number_of_places] [radius_km]
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+from models.engine.geo_index import GridIndex, haversine_km
+
+QUERIES = 100
+
+
+def linear_scan(places, lat, lon, radius_km):
+    """Returns the keys within radius_km by checking every place"""
+    return sorted((haversine_km(lat, lon, place.latitude, place.longitude),
+                   key) for key, place in places.items()
+                  if haversine_km(lat, lon, place.latitude,
+                                  place.longitude) <= radius_km)
+
+
+def main(count, radius_km):
+    """Times both strategies on count random places in the US"""
+    random.seed(0)
+    places = {
+        i: SimpleNamespace(latitude=random.uniform(25, 49),
+                           longitude=random.uniform(-124, -67))
+        for i in range(count)}
+    queries = [(random.uniform(25, 49), random.uniform(-124, -67))
+               for _ in range(QUERIES)]
+
+    start = time.perf_counter()
+    index = GridIndex()
+    for key, place in places.items():
+        index.add(key, place)
+    print("index build     {:>10.2f} s".format(time.perf_counter() - start))
+
+    start = time.perf_counter()
+    found = sum(len(index.near(lat, lon, radius_km)) for lat, lon in queries)
+    elapsed = time.perf_counter() - start
+    print("grid index      {:>10.2f} ms/query ({} hits)".format(
+        elapsed * 1000 / QUERIES, found))
+
+    # The scan is slow, so it only runs a few of the queries
+    scanned = queries[:3]
+    start = time.perf_counter()
+    for lat, lon in scanned:
+        linear_scan(places, lat, lon, radius_km)
+    elapsed = time.perf_counter() - start
+    print("linear scan     {:>10.2f} ms/query".format(
+        elapsed * 1000 / len(scanned)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 10.0)
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Measures the memory used per object by regular and compact models.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_memory [number_of_objects]
+"""
+
+import gc
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+from models.compact import compact_class
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+def sample(cls, i):
+    """Returns a dictionary like the ones reload() reads for cls"""
+    now = datetime.now().isoformat()
+    values = {"__class__": cls.__name__, "id": str(uuid.uuid4()),
+              "created_at": now, "updated_at": now}
+    if cls is Review:
+        values.update(place_id=str(uuid.uuid4()), user_id=str(uuid.uuid4()),
+                      text="Review #{}".format(i))
+    elif cls is Place:
+        values.update(city_id=str(uuid.uuid4()), name="Place #{}".format(i),
+                      price_by_night=i % 500, latitude=i / 1000.0)
+    else:
+        values.update(email="user{}@hbnb.io".format(i))
+    return values
+
+
+def measure(build, samples):
+    """Returns the bytes allocated per instance built from samples"""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(dict(values)) for values in samples]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    # Strings are shared with samples; parsed timestamps are counted
+    return size / len(samples)
+
+
+def main(count):
+    """Prints the memory per object of each model class"""
+    print("{:<10}{:>14}{:>14}".format("class", "regular", "compact"))
+    for cls in (Review, Place, User):
+        samples = [sample(cls, i) for i in range(count)]
+        # Compact classes are picked per object, as reload() does
+        print("{:<10}{:>12.0f} B{:>12.0f} B".format(
+            cls.__name__, measure(lambda values: cls(**values), samples),
+            measure(lambda values: compact_class(cls, values)(**values),
+                    samples)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
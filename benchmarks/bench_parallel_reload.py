@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Measures sharded FileStorage.reload() with the shards parsed serially,
+on threads and in process pools of growing size.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_parallel_reload [number_of_objects] [shards]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+from datetime import datetime
+from models.engine.file_storage import FileStorage
+
+
+def write_shards(directory, count, shards):
+    """Writes count Users spread over shards shard files"""
+    now = datetime.now().isoformat()
+    storage = FileStorage()
+    objects = {}
+    for i in range(count):
+        obj_id = "{:036d}".format(i)
+        key = "User." + obj_id
+        objects.setdefault(storage._shard_name(key), {})[key] = {
+            "__class__": "User", "id": obj_id, "created_at": now,
+            "updated_at": now, "email": "user{}@hbnb.io".format(i),
+            "first_name": "Betty", "last_name": "Holberton",
+        }
+    os.makedirs(directory)
+    for name, shard in objects.items():
+        with open(os.path.join(directory, name), "w",
+                  encoding="utf-8") as file:
+            json.dump(shard, file)
+
+
+def timed_reload(workers, processes):
+    """Returns the seconds taken by a reload with the given pool sizes"""
+    FileStorage._FileStorage__objects.clear()
+    FileStorage._FileStorage__by_class.clear()
+    FileStorage.reload_workers = workers
+    FileStorage.reload_processes = processes
+    start = time.perf_counter()
+    FileStorage().reload()
+    return time.perf_counter() - start
+
+
+def main(count, shards):
+    """Reloads count objects in shards shards with every strategy"""
+    FileStorage.sharded = True
+    FileStorage.shards_per_class = shards
+    cores = os.cpu_count() or 1
+    runs = [("serial", 1, 0), ("{} threads".format(cores), cores, 0)]
+    processes = 1
+    while processes <= cores:
+        runs.append(("{} processes".format(processes), 1, processes))
+        processes *= 2
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__journal_path = path + ".log"
+        FileStorage._FileStorage__shard_path = path + ".d"
+        write_shards(path + ".d", count, shards)
+        baseline = None
+        for name, workers, processes in runs:
+            elapsed = timed_reload(workers, processes)
+            baseline = baseline or elapsed
+            print("{:<16}{:>12,.0f} objects/s{:>8.2f}x".format(
+                name, count / elapsed, baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 16)
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Measures FileStorage.reload() throughput in objects per second.
+
+Compares the current reload with the former strptime based constructor.
+Run from the repository root:
+
+    python3 -m benchmarks.bench_reload [number_of_objects]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+from datetime import datetime
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+
+def write_snapshot(path, count):
+    """Writes a snapshot of count Users to path"""
+    now = datetime.now().isoformat()
+    objects = {}
+    for i in range(count):
+        obj_id = "{:036d}".format(i)
+        objects["User." + obj_id] = {
+            "__class__": "User", "id": obj_id, "created_at": now,
+            "updated_at": now, "email": "user{}@hbnb.io".format(i),
+            "first_name": "Betty", "last_name": "Holberton",
+        }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(objects, file)
+
+
+def legacy_reload(path):
+    """Reloads path the way BaseModel(**kwargs) used to build objects"""
+    with open(path, encoding="utf-8") as file:
+        for value in json.load(file).values():
+            obj = User.__new__(User)
+            for key, item in value.items():
+                if key == 'created_at' or key == 'updated_at':
+                    object.__setattr__(obj, key, datetime.strptime(
+                        item, "%Y-%m-%dT%H:%M:%S.%f"))
+                elif key != '__class__':
+                    object.__setattr__(obj, key, item)
+
+
+def current_reload(path):
+    """Reloads path with FileStorage"""
+    FileStorage._FileStorage__objects.clear()
+    FileStorage._FileStorage__by_class.clear()
+    FileStorage().reload()
+
+
+def main(count):
+    """Runs both reloads on a snapshot of count objects"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__journal_path = path + ".log"
+        write_snapshot(path, count)
+        for name, reload in (("strptime (before)", legacy_reload),
+                             ("fromisoformat (after)", current_reload)):
+            start = time.perf_counter()
+            reload(path)
+            elapsed = time.perf_counter() - start
+            print("{:<24}{:>12,.0f} objects/s".format(name, count / elapsed))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -2,10 +2,18 @@
 """
 This module contains the HBNBCommand class, the entry
 point for the HBNB Command-Line Interface.
+
+Run with `--batch <file>` (or `--batch -`), or with commands piped on
+stdin, to execute them in batch mode: without prompts and with all the
+changes written once at the end.
 """
 
 import re
 import cmd
+import sys
+import time
+from collections import namedtuple
+from itertools import islice
 from models.base_model import BaseModel
 from models.user import User
 from models.amenity import Amenity
@@ -13,9 +21,75 @@ from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
+from models import storage
 import json
 
 
+DotCommand = namedtuple("DotCommand", "class_name method handler args")
+
+_DOT_COMMAND = re.compile(r"(\w+)\.(\w+)\((.*?)\)")
+_UPDATE_DICT = re.compile(r'"(.*?)",\s*(\{.*\})')
+
+
+def _json_args(params):
+    """Parses the comma separated JSON values of params into a tuple"""
+    if not params:
+        return ()
+    # Fast path for the common lone id, a string without escapes
+    if len(params) > 1 and params[0] == params[-1] == '"' and \
+            '"' not in params[1:-1] and "\\" not in params:
+        return (params[1:-1],)
+    return tuple(json.loads(f"[{params}]"))
+
+
+def _raw_args(params):
+    """Keeps params as written, for the handler to parse"""
+    return params
+
+
+def _index_args(params):
+    """Splits params into unquoted names"""
+    return tuple(param.strip().strip("'\"") for param in params.split(","))
+
+
+# method: (HBNBCommand handler, parser of the text between parentheses)
+DOT_COMMANDS = {
+    "all": ("_dot_all", _json_args),
+    "count": ("_dot_count", _json_args),
+    "show": ("_dot_show", _json_args),
+    "destroy": ("_dot_destroy", _json_args),
+    "where": ("_dot_where", _raw_args),
+    "explain": ("_dot_explain", _raw_args),
+    "index": ("_dot_index", _index_args),
+    "update": ("_dot_update", _json_args),
+}
+
+
+def parse_dot_command(line):
+    """
+    Parses a ClassName.method(arguments) line into a DotCommand, or
+    returns None if it is not one. handler is None for unknown methods
+    and args None for arguments that do not parse.
+    """
+    match = _DOT_COMMAND.fullmatch(line)
+    if match is None:
+        return None
+    class_name, method, params = match.groups()
+    handler, parse = DOT_COMMANDS.get(method, (None, None))
+    if handler is None:
+        return DotCommand(class_name, method, None, None)
+    if method == "update":
+        update_dict = _UPDATE_DICT.fullmatch(params)
+        if update_dict:
+            return DotCommand(class_name, method, "_dot_update_dict",
+                              update_dict.groups())
+    try:
+        args = parse(params)
+    except ValueError:
+        args = None
+    return DotCommand(class_name, method, handler, args)
+
+
 class HBNBCommand(cmd.Cmd):
     """
     HBNBCommand class provides a command-line interface.
@@ -32,65 +106,100 @@ class HBNBCommand(cmd.Cmd):
         'State': State,
         'Place': Place
     }
-    instance_dict = {}
+
+    read_only = ('id', 'created_at', 'updated_at', '__class__')
+
+    @staticmethod
+    def _supported(method):
+        """Tells whether storage has method, printing an error if not"""
+        if hasattr(storage, method):
+            return True
+        print("** not supported by this storage **")
+        return False
 
     def default(self, arg):
         """
         Handle special cases for commands in dot notation like ClassName.all().
         """
-        match = re.fullmatch(r"(\w+)\.(\w+)\((.*?)\)", arg)
-    
-        if match:
-            class_name, command, params = match.groups()
-    
-            if class_name in self.class_mapping:
-                if command in ["all", "count", "show", "destroy"]:
-                    # For these commands, we'll use the original logic.
-                    param_list = json.loads(f"[{params}]")  # Parsing parameters as list
-    
-                    if command == "all":
-                        self.do_all(class_name)
-                    elif command == "count":
-                        count = sum(1 for key in self.instance_dict if key.startswith(class_name))
-                        print(count)
-                    elif command == "show":
-                        if not param_list or len(param_list) < 1:
-                            print("** instance id missing **")
-                        else:
-                            self.do_show(f"{class_name} {param_list[0]}")
-                    elif command == "destroy":
-                        if not param_list or len(param_list) < 1:
-                            print("** instance id missing **")
-                        else:
-                            self.do_destroy(f"{class_name} {param_list[0]}")
-                elif command == "update":
-                    # Handle update command with JSON dictionary support
-                    if re.fullmatch(r'".*",\s*\{.*\}', params):
-                        id_match, json_dict = re.fullmatch(r'"(.*?)",\s*(\{.*\})', params).groups()
-                        self.do_update(f"{class_name} {id_match} {json_dict}")
-                    else:
-                        param_list = json.loads(f"[{params}]")
-    
-                        if not param_list or len(param_list) < 3:
-                            if len(param_list) < 2:
-                                print("** instance id missing **")
-                            elif len(param_list) < 3:
-                                print("** attribute name missing **")
-                            else:
-                                print("** value missing **")
-                        else:
-                            self.do_update(
-                                f"{class_name} "
-                                f"{param_list[0]} "
-                                f"{param_list[1]} "
-                                f"{param_list[2]}"
-                            )
-                else:
-                    print(f"*** Unknown command: {command}")
+        command = parse_dot_command(arg)
+        if command is None:
+            print(f"*** Unknown syntax: {arg}")
+        elif command.class_name not in self.class_mapping:
+            print("** class doesn't exist **")
+        elif command.handler is None:
+            print(f"*** Unknown command: {command.method}")
+        elif command.args is None:
+            print(f"*** Unknown syntax: {arg}")
+        else:
+            getattr(self, command.handler)(command.class_name, command.args)
+
+    # ----- dot notation handlers, see DOT_COMMANDS -----
+    def _dot_all(self, class_name, args):
+        """ClassName.all()"""
+        self.do_all(class_name)
+
+    def _dot_count(self, class_name, args):
+        """ClassName.count()"""
+        print(storage.count(class_name))
+
+    def _dot_show(self, class_name, args):
+        """ClassName.show(id)"""
+        if not args:
+            print("** instance id missing **")
+        else:
+            self.do_show(f"{class_name} {args[0]}")
+
+    def _dot_destroy(self, class_name, args):
+        """ClassName.destroy(id)"""
+        if not args:
+            print("** instance id missing **")
+        else:
+            self.do_destroy(f"{class_name} {args[0]}")
+
+    def _dot_where(self, class_name, conditions, explain=False):
+        """ClassName.where(conditions)"""
+        if not self._supported("where"):
+            return
+        try:
+            result = storage.where(class_name, conditions, explain=explain)
+        except ValueError as error:
+            print(f"** {error} **")
+            return
+        if explain:
+            print(result)
+        else:
+            print([str(instance) for instance in result])
+
+    def _dot_explain(self, class_name, conditions):
+        """ClassName.explain(conditions)"""
+        self._dot_where(class_name, conditions, explain=True)
+
+    def _dot_index(self, class_name, args):
+        """ClassName.index(attribute[, "hash" | "sorted"])"""
+        if not args[0]:
+            print("** attribute name missing **")
+            return
+        if not self._supported("create_index"):
+            return
+        try:
+            storage.create_index(class_name, *args[:2])
+        except ValueError as error:
+            print(f"** {error} **")
+
+    def _dot_update(self, class_name, args):
+        """ClassName.update(id, attribute, value)"""
+        if len(args) < 3:
+            if len(args) < 2:
+                print("** instance id missing **")
             else:
-                print("** class doesn't exist **")
+                print("** attribute name missing **")
         else:
-            print(f"*** Unknown syntax: {arg}")
+            self.do_update(f"{class_name} {args[0]} {args[1]} {args[2]}")
+
+    def _dot_update_dict(self, class_name, args):
+        """ClassName.update(id, {attribute: value, ...})"""
+        instance_id, json_dict = args
+        self.do_update(f"{class_name} {instance_id} {json_dict}")
 
     # ----- basic commands -----
     def do_create(self, arg):
@@ -106,9 +215,37 @@ class HBNBCommand(cmd.Cmd):
 
         new_instance = self.class_mapping[class_name]()
         new_instance.save()
-        self.instance_dict[class_name + ' ' + new_instance.id] = new_instance
         print(new_instance.id)
 
+    def do_create_many(self, arg):
+        """Creates n instances in one write: create_many <class> <n>"""
+        args = arg.split()
+        if not args:
+            print("** class name missing **")
+            return
+
+        class_name = args[0]
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **")
+            return
+
+        if len(args) < 2:
+            print("** count missing **")
+            return
+
+        try:
+            count = int(args[1])
+        except ValueError:
+            count = 0
+        if count <= 0:
+            print("** invalid count **")
+            return
+
+        cls = self.class_mapping[class_name]
+        with storage.batch():
+            # New instances are already dirty, the batch writes them once
+            print("\n".join(cls().id for _ in range(count)))
+
     def do_show(self, arg):
         """Prints the string representation of an instance."""
         args = arg.split()
@@ -125,13 +262,12 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        instance_id = args[1]
-        key = class_name + ' ' + instance_id
-        if key not in self.instance_dict:
+        instance = storage.get(class_name, args[1])
+        if instance is None:
             print("** no instance found **")
             return
 
-        print(self.instance_dict[key])
+        print(instance)
 
     def do_destroy(self, arg):
         """Deletes an instance based on the class name and id."""
@@ -149,38 +285,98 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        instance_id = args[1]
-        key = class_name + ' ' + instance_id
-        if key not in self.instance_dict:
+        instance = storage.get(class_name, args[1])
+        if instance is None:
             print("** no instance found **")
             return
 
         # Deletion of instance
-        del self.instance_dict[key]
+        storage.delete(instance)
+        storage.save()
 
     def do_all(self, arg):
-        """Prints all string representations of all instances."""
-        args = arg.split()
-        instances_list = []
-
-        if not args:
-            for key, value in self.instance_dict.items():
-                class_name, _ = key.split()
-                if class_name in self.class_mapping:
-                    instances_list.append(str(value))
-            print(instances_list)
-            return
+        """
+        Prints all string representations of all instances:
+        all [class] [--lines | --json] [--offset=n] [--limit=n]
+        [--after=cursor]
+        """
+        class_name = None
+        options = {"mode": "list", "offset": 0, "limit": None, "after": None}
+        for word in arg.split():
+            name, _, value = word.partition("=")
+            if not word.startswith("--"):
+                class_name = word
+            elif name in ("--lines", "--json") and not value:
+                options["mode"] = name[2:]
+            elif name in ("--offset", "--limit") and value.isdigit():
+                options[name[2:]] = int(value)
+            elif name == "--after" and value:
+                options["after"] = value
+            else:
+                print(f"** invalid option: {word} **")
+                return
 
-        class_name = args[0]
-        if class_name not in self.class_mapping:
+        if class_name is None:
+            objects = storage.all()
+        elif class_name not in self.class_mapping:
             print("** class doesn't exist **")
             return
+        else:
+            objects = storage.all(class_name)
+        self._print_objects(objects, **options)
 
-        for key, value in self.instance_dict.items():
-            if key.startswith(class_name):
-                instances_list.append(str(value))
-
-        print(instances_list)
+    @staticmethod
+    def _print_objects(objects, mode, offset, limit, after):
+        """
+        Writes a page of objects as they are read, without building the
+        whole output: as the repr of the list of their strings (mode
+        "list"), one string per line ("lines") or one JSON dictionary per
+        line ("json"). When the page is followed by more objects, the
+        cursor to pass as --after for the next one is written to stderr:
+        <position>:<key>, the position of the next object in the listing
+        and the key of the last one printed. The listing is resumed at the
+        position if the key is still found just before it, and after the
+        key wherever it moved otherwise; a cursor whose object no longer
+        exists is reported as invalid.
+        """
+        keys = iter(objects)
+        position = 0
+        if after is not None:
+            seek, _, after = after.rpartition(":")
+            position = int(seek) if seek.isdigit() else 0
+            # Skipped in C, without fetching the objects
+            if not position or \
+                    next(islice(keys, position - 1, None), None) != after:
+                keys = iter(objects)
+                for position, key in enumerate(keys, 1):
+                    if key == after:
+                        break
+                else:
+                    print("** invalid cursor **")
+                    return
+        items = ((key, objects[key]) for key in keys)
+        page = islice(items, offset, None if limit is None else offset + limit)
+        write = sys.stdout.write
+        last_key = None
+        if mode == "list":
+            write("[")
+        position += offset
+        for count, (key, instance) in enumerate(page, 1):
+            if mode == "list":
+                write((", " if count > 1 else "") + repr(str(instance)))
+            elif mode == "lines":
+                write(str(instance) + "\n")
+            else:
+                write(json.dumps(instance.to_dict(), default=str) + "\n")
+            last_key = key
+            if count % 1000 == 0:
+                sys.stdout.flush()
+        if mode == "list":
+            write("]\n")
+        if limit is not None and last_key is not None and \
+                next(items, None) is not None:
+            print(f"next page: --after={position + count}:{last_key}",
+                  file=sys.stderr)
 
     def do_update(self, arg):
         """Updates an instance based on the class name and id."""
@@ -198,10 +394,8 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
     
-        instance_id = args[1]
-        key = f"{class_name} {instance_id}"
-    
-        if key not in self.instance_dict:
+        instance = storage.get(class_name, args[1])
+        if instance is None:
             print("** no instance found **")
             return
     
@@ -213,7 +407,6 @@ class HBNBCommand(cmd.Cmd):
                 print("** invalid dictionary format **")
                 return
     
-            instance = self.instance_dict[key]
             for attribute_name, attribute_value in attributes.items():
                 try:
                     # Attempt to cast the attribute value to the correct type
@@ -239,10 +432,113 @@ class HBNBCommand(cmd.Cmd):
             except json.JSONDecodeError:
                 attribute_value = args[3]  # If it fails, keep it as a string
     
-            instance = self.instance_dict[key]
             setattr(instance, attribute_name, attribute_value)
             instance.save()  # Save the updated instance
 
+    def do_update_many(self, arg):
+        """
+        Updates instances from JSON lines in one write:
+        update_many <class> <file | ->, each line being {"<id>": {...}}
+        """
+        args = arg.split()
+        if not args:
+            print("** class name missing **")
+            return
+
+        class_name = args[0]
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **")
+            return
+
+        if len(args) < 2:
+            print("** file name missing **")
+            return
+
+        if args[1] == "-":
+            self._update_many(class_name, sys.stdin)
+            return
+        try:
+            file = open(args[1], encoding="utf-8")
+        except OSError as error:
+            print(f"** cannot read {args[1]}: {error.strerror} **")
+            return
+        with file:
+            self._update_many(class_name, file)
+
+    def _update_many(self, class_name, lines):
+        """Applies the {id: attributes} JSON lines to class_name objects"""
+        with storage.batch():
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    updates = json.loads(line)
+                except json.JSONDecodeError:
+                    updates = None
+                if not isinstance(updates, dict) or not all(
+                        isinstance(value, dict) for value in updates.values()):
+                    print(f"** invalid update on line {number} **")
+                    continue
+                for instance_id, attributes in updates.items():
+                    instance = storage.get(class_name, instance_id)
+                    if instance is None:
+                        print(f"** no instance found: {instance_id} **")
+                        continue
+                    for attribute_name, value in attributes.items():
+                        # The identity of an instance is not updatable
+                        if attribute_name not in self.read_only:
+                            setattr(instance, attribute_name, value)
+                    instance.save()
+                    print(instance_id)
+
+    def do_near(self, arg):
+        """Prints the places within a radius: near <lat> <lon> <radius_km>"""
+        args = arg.split()
+        if len(args) < 3:
+            print("** coordinates missing **")
+            return
+
+        try:
+            latitude, longitude, radius = (float(value) for value in args[:3])
+        except ValueError:
+            print("** invalid coordinates **")
+            return
+
+        if not self._supported("places_near"):
+            return
+        print([str(place) for _, place
+               in storage.places_near(latitude, longitude, radius)])
+
+    def do_convert(self, arg):
+        """Rewrites the storage files in a format: convert <json|pickle|...>"""
+        if not arg:
+            print("** format name missing **")
+            return
+
+        if not self._supported("convert"):
+            return
+        try:
+            storage.convert(arg.split()[0])
+        except ValueError as error:
+            print(f"** {error} **")
+
+    def run_batch(self, file):
+        """
+        Runs the commands read from file in a single storage batch, so
+        their saves are written once at the end, and returns how many
+        were run.
+        """
+        count = 0
+        with storage.batch():
+            for line in file:
+                if not line.strip():
+                    continue
+                line = self.precmd(line.rstrip("\r\n"))
+                count += 1
+                if self.postcmd(self.onecmd(line), line):
+                    break
+        return count
+
     def do_help(self, args):
         """Prints help information for the provided command."""
         super().do_help(args)
@@ -260,5 +556,38 @@ class HBNBCommand(cmd.Cmd):
         return True
 
 
+def main(args):
+    """Starts the console, in batch mode when asked or when piped to"""
+    console = HBNBCommand()
+    if args[:1] == ["--batch"]:
+        if len(args) < 2:
+            print("usage: console.py [--batch <file> | --batch -]",
+                  file=sys.stderr)
+            return 2
+        path = args[1]
+    elif not sys.stdin.isatty():
+        path = "-"
+    else:
+        console.cmdloop()
+        return 0
+
+    start = time.perf_counter()
+    if path == "-":
+        count = console.run_batch(sys.stdin)
+    else:
+        try:
+            file = open(path, encoding="utf-8")
+        except OSError as error:
+            print("** cannot read {}: {} **".format(path, error.strerror),
+                  file=sys.stderr)
+            return 1
+        with file:
+            count = console.run_batch(file)
+    elapsed = time.perf_counter() - start
+    print("{} commands in {:.3f}s ({:,.0f} commands/s)".format(
+        count, elapsed, count / elapsed if elapsed else 0), file=sys.stderr)
+    return 0
+
+
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    sys.exit(main(sys.argv[1:]))
@@ -1,11 +1,22 @@
 #!/usr/bin/python3
 """
-This module initializes the FileStorage instance for the application.
+This module initializes the storage instance for the application.
+
+FileStorage is used by default; set HBNB_TYPE_STORAGE=db to use the
+SQLite backed DBStorage instead.
 """
 
-from models.engine.file_storage import FileStorage
+import os
 from models.base_model import BaseModel
 
 
-storage = FileStorage()
-storage.reload()
+if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+    storage.reload()
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage()
+    # Worker processes would import models again, or wait forever on
+    # the import in progress, so the shards are parsed on threads here
+    storage.reload(processes=False)
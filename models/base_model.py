@@ -23,30 +23,43 @@ class BaseModel:
             models.storage.new(self)
         else:
             # Instance from dictionary, convert attributes
-            for key, value in kwargs.items():
-                if key == 'created_at' or key == 'updated_at':
-                    setattr(
-                            self, key,
-                            datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
-                    )
-                elif key != '__class__':
-                    # Handling __class__ attribute
-                    setattr(self, key, value)
+            kwargs.pop('__class__', None)
+            for key in ('created_at', 'updated_at'):
+                value = kwargs.get(key)
+                if isinstance(value, str):
+                    # Accepts isoformat() output with or without microseconds
+                    kwargs[key] = datetime.fromisoformat(value)
+            self._set_attributes(kwargs)
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and flags the instance as dirty in storage."""
+        # object directly rather than super(): this runs on every assignment
+        object.__setattr__(self, name, value)
+        models.storage.mark_dirty(self, name)
+
+    def _set_attributes(self, attributes):
+        """Sets attributes in bulk, bypassing the dirty hook."""
+        # Only used before the instance is tracked by storage
+        self.__dict__.update(attributes)
+
+    def _attributes(self):
+        """Returns the instance attributes as a dictionary."""
+        return self.__dict__
 
     def __str__(self):
         """String representation of BaseModel."""
         return "[{}] ({}) {}".format(
-                self.__class__.__name__, self.id, self.__dict__
+                self.__class__.__name__, self.id, self._attributes()
                 )
 
     def save(self):
         """Updates updated_at with the current datetime."""
         self.updated_at = datetime.now()
-        models.storage.save()
+        models.storage.save(self)
 
     def to_dict(self):
         """Returns a dictionary representation of the instance."""
-        new_dict = self.__dict__.copy()
+        new_dict = dict(self._attributes())
         new_dict['__class__'] = self.__class__.__name__
         new_dict['created_at'] = self.created_at.isoformat()
         new_dict['updated_at'] = self.updated_at.isoformat()
@@ -3,10 +3,17 @@
 Module inherits from BaseModel class.
 """
 
+import models
 from models.base_model import BaseModel
+from models.place import Place
 
 
 class City(BaseModel):
     """City class that inherits from BaseModel"""
     state_id = ""
     name = ""
+
+    @property
+    def places(self):
+        """List of the Place instances with city_id equal to this id"""
+        return list(models.storage.find(Place, "city_id", self.id).values())
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Provides slots-backed variants of the model classes for bulk loading.
+
+compact_class(User) returns a subclass of User, also named User, that
+stores id, the timestamps and every attribute declared on the class
+(email, password, ...) in __slots__. An unset slot reads as the class
+default, just like a plain instance without that attribute, and any
+other attribute (e.g. one added by the console's update) goes to the
+instance __dict__, which is only allocated when first needed.
+
+compact_class(Place, attributes) only gives slots to the declared
+attributes among attributes, typically the keys of the dictionary an
+instance is built from: a place that never set its description or
+amenity_ids does not pay a slot for them. Classes are cached per set
+of slots, so the objects of a store share a handful of them.
+"""
+
+from models.base_model import BaseModel
+
+_compact_classes = {}
+_declared = {}
+
+
+class _SlotDefault:
+    """Slot accessor falling back to the class default while unset."""
+    __slots__ = ("slot", "default")
+
+    def __init__(self, slot, default):
+        """Wraps the member descriptor slot."""
+        self.slot = slot
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        """Returns the slot value, or the default if it was never set."""
+        if obj is None:
+            return self.default
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            return self.default
+
+    def __set__(self, obj, value):
+        """Stores value in the slot."""
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj):
+        """Clears the slot, exposing the default again."""
+        self.slot.__delete__(obj)
+
+
+def declared_attributes(cls):
+    """Returns {name: default} of the public data attributes of cls."""
+    attributes = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and not callable(value) and \
+                    not hasattr(value, "__get__"):
+                attributes[name] = value
+    return attributes
+
+
+def _set_attributes(self, attributes):
+    """Sets attributes in bulk, bypassing the dirty hook."""
+    slots = type(self)._slot_names
+    overflow = {}
+    for name, value in attributes.items():
+        if name in slots:
+            object.__setattr__(self, name, value)
+        else:
+            overflow[name] = value
+    if overflow:
+        object.__setattr__(self, "_overflow", True)
+        self.__dict__.update(overflow)
+
+
+def __setattr__(self, name, value):
+    """Records the use of __dict__ before setting the attribute."""
+    if name not in type(self)._slot_names:
+        object.__setattr__(self, "_overflow", True)
+    type(self)._compact_of.__setattr__(self, name, value)
+
+
+def _attributes(self):
+    """Returns the set slots followed by the overflow attributes."""
+    attributes = {}
+    for name, member in type(self)._slot_members:
+        try:
+            attributes[name] = member.__get__(self)
+        except AttributeError:
+            pass
+    # Reading __dict__ would allocate it, so only do so once it is used
+    if self._overflow:
+        attributes.update(self.__dict__)
+    return attributes
+
+
+def compact_class(cls, attributes=None):
+    """
+    Returns the slots-backed variant of the model class cls, with slots
+    for the declared attributes among attributes (all if None).
+    """
+    if "_compact_of" in vars(cls):
+        return cls
+    declared = _declared.get(cls)
+    if declared is None:
+        declared = _declared[cls] = declared_attributes(cls)
+    if attributes is None:
+        names = tuple(declared)
+    else:
+        names = tuple(name for name in declared if name in attributes)
+    compact = _compact_classes.get((cls, names))
+    if compact is None:
+        slot_names = ("id", "created_at", "updated_at") + names
+        compact = type(cls.__name__, (cls,), {
+            "__slots__": slot_names + ("_overflow",),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+            "_compact_of": cls,
+            "_slot_names": frozenset(slot_names),
+            "__setattr__": __setattr__,
+            "_set_attributes": _set_attributes,
+            "_attributes": _attributes,
+        })
+        compact._slot_members = tuple(
+            (name, vars(compact)[name]) for name in slot_names)
+        compact._overflow = _SlotDefault(vars(compact)["_overflow"], False)
+        for name in names:
+            setattr(compact, name,
+                    _SlotDefault(vars(compact)[name], declared[name]))
+        _compact_classes[(cls, names)] = compact
+    return compact
+
+
+def is_compact(obj):
+    """Tells whether obj is an instance of a compact class."""
+    return isinstance(obj, BaseModel) and "_compact_of" in vars(type(obj))
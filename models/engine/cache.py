@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Module for the LRUCache class.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    {key: obj} mapping holding at most `capacity` entries (no limit when
+    capacity is 0), evicting the least recently used one first.
+
+    on_evict(key, obj) is called for every evicted entry, e.g. to write
+    it back to disk. get() counts hits and misses; peek() does not and
+    leaves the order untouched.
+    """
+
+    def __init__(self, capacity=0, on_evict=None):
+        """Initializes an empty cache"""
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__on_evict = on_evict
+
+    def __len__(self):
+        """Returns the number of cached entries"""
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        """Tells whether key is cached"""
+        return key in self.__entries
+
+    def get(self, key, default=None):
+        """Returns the entry of key and marks it as the most recent"""
+        obj = self.__entries.get(key)
+        if obj is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return obj
+
+    def peek(self, key, default=None):
+        """Returns the entry of key without counting or reordering"""
+        return self.__entries.get(key, default)
+
+    def put(self, key, obj):
+        """Caches obj under key, evicting the oldest entries if full"""
+        self.__entries[key] = obj
+        self.__entries.move_to_end(key)
+        while self.capacity and len(self.__entries) > self.capacity:
+            old_key, old_obj = self.__entries.popitem(last=False)
+            self.evictions += 1
+            if self.__on_evict is not None:
+                self.__on_evict(old_key, old_obj)
+
+    def pop(self, key, default=None):
+        """Removes and returns the entry of key, without eviction"""
+        return self.__entries.pop(key, default)
+
+    def stats(self):
+        """Returns the counters and the size of the cache"""
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "size": len(self.__entries),
+                "capacity": self.capacity}
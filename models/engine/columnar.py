@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""
+Module for the ColumnStore class.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def numeric_fields(cls):
+    """Returns the names of the int and float class attributes of cls"""
+    return tuple(name for name in dir(cls)
+                 if not name.startswith("_")
+                 and type(getattr(cls, name)) in (int, float))
+
+
+def _number(value):
+    """Converts value to a float, or NaN when it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class ColumnStore:
+    """
+    Numeric attributes of the objects of one class kept in typed columns.
+
+    Row i of every column belongs to the object stored under keys[i].
+    Storage keeps the columns in step with new(), attribute updates and
+    delete() through add(), update() and remove(). Values that are not
+    numbers are stored as NaN and left out of filters and aggregates.
+
+    The first range filter on a field sorts its values once; the order
+    is then kept up to date, so filters find their rows by bisection.
+    """
+
+    def __init__(self, fields):
+        """Initializes empty columns for fields"""
+        self.fields = tuple(fields)
+        self.keys = []
+        self.__rows = {}
+        self.__columns = {field: array("d") for field in self.fields}
+        self.__sorted = {}
+
+    def __len__(self):
+        """Returns the number of rows"""
+        return len(self.keys)
+
+    def column(self, field):
+        """Returns the array holding field"""
+        return self.__columns[field]
+
+    def add(self, key, obj):
+        """Appends a row for obj"""
+        if key in self.__rows:
+            self.update(key, obj)
+            return
+        self.__rows[key] = len(self.keys)
+        self.keys.append(key)
+        for field, column in self.__columns.items():
+            value = _number(getattr(obj, field, None))
+            column.append(value)
+            if field in self.__sorted:
+                self._insort(field, key, value)
+
+    def update(self, key, obj, name=None):
+        """Refreshes the row of obj, or only its column name"""
+        row = self.__rows.get(key)
+        if row is None:
+            self.add(key, obj)
+            return
+        fields = self.fields if name is None else (name,)
+        for field in fields:
+            column = self.__columns.get(field)
+            if column is None:
+                continue
+            old, value = column[row], _number(getattr(obj, field, None))
+            if old == value or (old != old and value != value):
+                continue
+            column[row] = value
+            if field in self.__sorted:
+                self._unsort(field, key, old)
+                self._insort(field, key, value)
+
+    def remove(self, key, obj=None):
+        """Drops the row of key, moving the last row into its place"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        for field in self.__sorted:
+            self._unsort(field, key, self.__columns[field][row])
+        last = self.keys.pop()
+        for column in self.__columns.values():
+            value = column.pop()
+            if row < len(self.keys):
+                column[row] = value
+        if row < len(self.keys):
+            self.keys[row] = last
+            self.__rows[last] = row
+
+    def _order(self, field):
+        """
+        Returns (values, keys) of the rows of field that are numbers,
+        sorted by value, sorting them on first use
+        """
+        order = self.__sorted.get(field)
+        if order is None:
+            column = self.__columns[field]
+            rows = sorted((row for row in range(len(self.keys))
+                           if column[row] == column[row]),
+                          key=column.__getitem__)
+            order = ([column[row] for row in rows],
+                     [self.keys[row] for row in rows])
+            self.__sorted[field] = order
+        return order
+
+    def _insort(self, field, key, value):
+        """Inserts the value of key in the sorted order of field"""
+        if value != value:
+            return
+        values, keys = self.__sorted[field]
+        i = bisect_right(values, value)
+        values.insert(i, value)
+        keys.insert(i, key)
+
+    def _unsort(self, field, key, value):
+        """Removes the value of key from the sorted order of field"""
+        if value != value:
+            return
+        values, keys = self.__sorted[field]
+        lo = bisect_left(values, value)
+        i = keys.index(key, lo, bisect_right(values, value, lo))
+        del values[i]
+        del keys[i]
+
+    def _keys(self, ranges):
+        """
+        Returns the keys of the rows within every (low, high) range of
+        ranges: the narrowest range is cut from its sorted order, and
+        its rows are checked against the other ranges
+        """
+        if not ranges:
+            return list(self.keys)
+        bounds = []
+        for field, (low, high) in ranges.items():
+            values, keys = self._order(field)
+            start = 0 if low is None else bisect_left(values, low)
+            stop = len(values) if high is None else bisect_right(values, high)
+            bounds.append((stop - start, field, start, stop))
+        bounds.sort()
+        _, field, start, stop = bounds[0]
+        keys = self.__sorted[field][1][start:stop]
+        for _, field, _, _ in bounds[1:]:
+            column = self.__columns[field]
+            low, high = ranges[field]
+            low = -math.inf if low is None else low
+            high = math.inf if high is None else high
+            keys = [key for key in keys
+                    if low <= column[self.__rows[key]] <= high]
+        return keys
+
+    def filter(self, **ranges):
+        """
+        Returns the keys of the rows whose fields fall in the inclusive
+        (low, high) ranges given by keyword, None meaning unbounded.
+        """
+        return self._keys(ranges)
+
+    def _values(self, field, ranges):
+        """Returns the non-NaN values of field in the matching rows"""
+        column = self.__columns[field]
+        if ranges:
+            values = [column[self.__rows[key]] for key in self._keys(ranges)]
+        else:
+            values = column
+        return [value for value in values if value == value]
+
+    def count(self, **ranges):
+        """Returns the number of rows matching ranges"""
+        return len(self._keys(ranges))
+
+    def sum(self, field, **ranges):
+        """Returns the sum of field over the rows matching ranges"""
+        return math.fsum(self._values(field, ranges))
+
+    def min(self, field, **ranges):
+        """Returns the smallest field value, or None without rows"""
+        return min(self._values(field, ranges), default=None)
+
+    def max(self, field, **ranges):
+        """Returns the largest field value, or None without rows"""
+        return max(self._values(field, ranges), default=None)
+
+    def mean(self, field, **ranges):
+        """Returns the average field value, or None without rows"""
+        values = self._values(field, ranges)
+        return math.fsum(values) / len(values) if values else None
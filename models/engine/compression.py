@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Optional gzip or lzma compression of the storage files.
+
+Files are compressed on the fly as the serializer writes them and are
+recognized by their magic number when read, whatever their name, so
+reload() decompresses them as it parses.
+"""
+
+import gzip
+import lzma
+from contextlib import nullcontext
+
+CODECS = {
+    "gzip": (".gz", b"\x1f\x8b"),
+    "lzma": (".xz", b"\xfd7zXZ\x00"),
+}
+MAGIC_SIZE = max(len(magic) for _, magic in CODECS.values())
+
+
+def extension(name):
+    """Returns the file extension of the codec name ('' for None)"""
+    if name is None:
+        return ""
+    try:
+        return CODECS[name][0]
+    except KeyError:
+        raise ValueError("unknown compression: {}".format(name)) from None
+
+
+def from_path(path):
+    """Returns the codec named by the extension of path, or None"""
+    for name, (suffix, _) in CODECS.items():
+        if path.endswith(suffix):
+            return name
+    return None
+
+
+def writer(file, name):
+    """Returns a binary writer compressing into file with the codec name"""
+    extension(name)
+    if name == "gzip":
+        # No name or timestamp, so equal stores give equal files
+        return gzip.GzipFile(filename="", mode="wb", compresslevel=6,
+                             fileobj=file, mtime=0)
+    if name == "lzma":
+        return lzma.LZMAFile(file, mode="wb")
+    return nullcontext(file)
+
+
+def reader(file):
+    """Returns a binary reader decompressing the buffered file if needed"""
+    head = file.peek(MAGIC_SIZE)
+    if head.startswith(CODECS["gzip"][1]):
+        return gzip.GzipFile(mode="rb", fileobj=file)
+    if head.startswith(CODECS["lzma"][1]):
+        return lzma.LZMAFile(file, mode="rb")
+    return file
@@ -0,0 +1,255 @@
+#!/usr/bin/python3
+"""
+Module for the DBStorage class.
+"""
+
+import os
+import json
+import sqlite3
+import weakref
+from contextlib import contextmanager
+from models.engine.cache import LRUCache
+from models.engine.file_storage import FileStorage
+
+
+class DBStorage:
+    """
+    SQLite storage engine with one table per BaseModel subclass.
+
+    Every table holds the id, the timestamps, one indexed column per
+    foreign key (class attributes ending in `_id`) and the full
+    dictionary representation of the instance as JSON. Rows are only
+    turned into instances when they are looked up.
+
+    Instances are kept in an LRU cache of `cache_size` objects (0 for no
+    limit). Evicted objects with unsaved changes are written to the
+    open transaction, and an evicted instance still in use elsewhere is
+    handed out again rather than a copy, so its changes are not lost.
+    """
+    cache_size = int(os.getenv("HBNB_DB_CACHE_SIZE", "0"))
+
+    def __init__(self, path=None):
+        """Initializes the engine; the database is opened by reload()"""
+        self.__path = path or os.getenv("HBNB_DB_PATH", "hbnb.db")
+        self.__connection = None
+        self.__classes = {}
+        self.__objects = LRUCache(self.cache_size, self._write_back)
+        self.__evicted = weakref.WeakValueDictionary()
+        self.__dirty = {}
+        self.__batch_depth = 0
+
+    @staticmethod
+    def _key(obj):
+        """Returns the storage key of obj: <obj class name>.id"""
+        return "{}.{}".format(obj.__class__.__name__, obj.id)
+
+    @staticmethod
+    def _foreign_keys(cls):
+        """Returns the names of the foreign key attributes of cls"""
+        return sorted(name for name in dir(cls)
+                      if name.endswith("_id") and not name.startswith("_")
+                      and isinstance(getattr(cls, name), str))
+
+    def _class_name(self, cls):
+        """Accepts a class or a class name and returns the class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def reload(self):
+        """Opens the database and creates the missing tables and indexes"""
+        self.close()
+        self.__classes = FileStorage._get_model_classes()
+        self.__objects = LRUCache(self.cache_size, self._write_back)
+        self.__evicted = weakref.WeakValueDictionary()
+        self.__dirty = {}
+        self.__connection = sqlite3.connect(self.__path)
+        with self.__connection:
+            for name, cls in self.__classes.items():
+                columns = "".join(", {} TEXT".format(column)
+                                  for column in self._foreign_keys(cls))
+                self.__connection.execute(
+                    "CREATE TABLE IF NOT EXISTS {} (id TEXT PRIMARY KEY, "
+                    "created_at TEXT, updated_at TEXT{}, data TEXT)"
+                    .format(name, columns))
+                for column in self._foreign_keys(cls):
+                    self.__connection.execute(
+                        "CREATE INDEX IF NOT EXISTS idx_{0}_{1} "
+                        "ON {0} ({1})".format(name, column))
+
+    def close(self):
+        """Writes pending changes and closes the database"""
+        if self.__connection is not None:
+            self.flush()
+            self.__connection.close()
+            self.__connection = None
+
+    def _write_back(self, key, obj):
+        """Writes obj if it has unsaved changes as the cache evicts it"""
+        self.__evicted[key] = obj
+        if self.__dirty.get(key) is obj:
+            self._write(key.split(".", 1)[0], obj)
+            del self.__dirty[key]
+
+    def _cached(self, key):
+        """Returns the tracked instance of key, or None"""
+        obj = self.__objects.get(key)
+        if obj is None:
+            obj = self.__evicted.pop(key, None)
+            if obj is not None:
+                self.__objects.put(key, obj)
+        return obj
+
+    def _build(self, name, key, data):
+        """Builds the instance of a row and caches it under key"""
+        obj = self.__classes[name](**json.loads(data))
+        self.__objects.put(key, obj)
+        return obj
+
+    def _materialize(self, name, obj_id, data):
+        """Returns the tracked instance for a row, building it if needed"""
+        key = "{}.{}".format(name, obj_id)
+        obj = self._cached(key)
+        if obj is None:
+            obj = self._build(name, key, data)
+        return obj
+
+    def cache_stats(self):
+        """Returns the hits, misses, evictions and size of the cache"""
+        return self.__objects.stats()
+
+    def _query(self, name, where="", params=()):
+        """Returns {key: obj} for the rows of table name matching where"""
+        if name not in self.__classes:
+            return {}
+        # Fetched first: evictions may write to the table being read
+        rows = self.__connection.execute(
+            "SELECT id, data FROM {} {}".format(name, where),
+            params).fetchall()
+        objects = {}
+        for obj_id, data in rows:
+            key = "{}.{}".format(name, obj_id)
+            if self.__dirty.get(key, False) is None:
+                continue
+            objects[key] = self._materialize(name, obj_id, data)
+        for key, obj in self.__dirty.items():
+            if (obj is not None and key.startswith(name + ".")
+                    and key not in objects and not where):
+                objects[key] = obj
+        return objects
+
+    def all(self, cls=None):
+        """Returns a dictionary of all objects, or of the objects of cls"""
+        if cls is not None:
+            return self._query(self._class_name(cls))
+        objects = {}
+        for name in self.__classes:
+            objects.update(self._query(name))
+        return objects
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id, or None"""
+        name = self._class_name(cls)
+        key = "{}.{}".format(name, id)
+        if key in self.__dirty:
+            return self.__dirty[key]
+        if name not in self.__classes:
+            return None
+        obj = self._cached(key)
+        if obj is None:
+            row = self.__connection.execute(
+                "SELECT data FROM {} WHERE id = ?".format(name),
+                (id,)).fetchone()
+            if row is not None:
+                obj = self._build(name, key, row[0])
+        return obj
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of cls"""
+        self.flush()
+        names = self.__classes if cls is None else [self._class_name(cls)]
+        return sum(self.__connection.execute(
+            "SELECT COUNT(*) FROM {}".format(name)).fetchone()[0]
+            for name in names if name in self.__classes)
+
+    def find(self, cls, attribute, value):
+        """Returns {key: obj} of the cls objects whose foreign key matches"""
+        name = self._class_name(cls)
+        if attribute not in self._foreign_keys(self.__classes[name]):
+            raise ValueError("{} is not a foreign key of {}"
+                             .format(attribute, name))
+        self.flush()
+        return self._query(name, "WHERE {} = ?".format(attribute), (value,))
+
+    def new(self, obj):
+        """Adds obj to the current database session"""
+        key = self._key(obj)
+        self.__dirty[key] = obj
+        self.__objects.put(key, obj)
+
+    def mark_dirty(self, obj, name=None):
+        """Flags obj as modified if it is tracked by this storage"""
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", None))
+        if self.__objects.peek(key) is obj or \
+                self.__evicted.get(key) is obj:
+            self.__dirty[key] = obj
+            if key not in self.__objects:
+                del self.__evicted[key]
+                self.__objects.put(key, obj)
+
+    def is_dirty(self, obj):
+        """Returns True if obj has changes that are not written yet"""
+        return self._key(obj) in self.__dirty
+
+    def delete(self, obj=None):
+        """Deletes obj from the database on the next save()"""
+        if obj is None:
+            return
+        key = self._key(obj)
+        self.__objects.pop(key, None)
+        self.__evicted.pop(key, None)
+        self.__dirty[key] = None
+
+    def save(self, obj=None):
+        """Commits the changes of the current session to the database"""
+        if obj is not None:
+            self.mark_dirty(obj)
+        if not self.__batch_depth:
+            self.flush()
+
+    def flush(self):
+        """Writes every dirty object in a single transaction"""
+        # Evicted objects may have been written to an open transaction
+        if not self.__dirty and not self.__connection.in_transaction:
+            return
+        with self.__connection:
+            for key, obj in self.__dirty.items():
+                name, obj_id = key.split(".", 1)
+                if obj is None:
+                    self.__connection.execute(
+                        "DELETE FROM {} WHERE id = ?".format(name), (obj_id,))
+                    continue
+                self._write(name, obj)
+        self.__dirty.clear()
+
+    def _write(self, name, obj):
+        """Inserts or replaces the row of obj"""
+        data = obj.to_dict()
+        foreign_keys = self._foreign_keys(self.__classes[name])
+        columns = ["id", "created_at", "updated_at"] + foreign_keys
+        values = [data["id"], data["created_at"], data["updated_at"]]
+        values += [getattr(obj, column) for column in foreign_keys]
+        values.append(json.dumps(data))
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO {} ({}, data) VALUES ({})".format(
+                name, ", ".join(columns), ", ".join("?" * len(values))),
+            values)
+
+    @contextmanager
+    def batch(self):
+        """Defers every save() in the block to a single transaction"""
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if not self.__batch_depth:
+                self.flush()
@@ -3,8 +3,24 @@
 Module for the FileStorage class.
 """
 
+import io
+import os
 import json
-import importlib
+import time
+import zlib
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from models.engine.json_stream import iter_items
+from models.compact import compact_class
+from models.engine.columnar import ColumnStore, numeric_fields
+from models.engine.geo_index import GridIndex
+from models.engine.relation_index import RelationIndex
+from models.engine import query
+from models.engine import serializers
+from models.engine import compression
+from models.engine.mmap_snapshot import MappedSnapshot, can_map
 from models.base_model import BaseModel
 from models.user import User
 from models.place import Place
@@ -14,13 +30,113 @@ from models.amenity import Amenity
 from models.review import Review
 
 
+def _parse_shard(path):
+    """Returns the (key, value) pairs stored in the shard at path"""
+    with open(path, mode="rb") as file:
+        return list(serializers.load(compression.reader(file)).items())
+
+
 class FileStorage:
     """
     File storage class for serializing and deserializing instances.
+
+    In journal mode, save() appends only the changed objects (or a
+    tombstone for deleted ones) to a log next to the snapshot; the log
+    is folded back into the snapshot every `compact_every` records.
+
+    Objects are flagged dirty when created, modified or saved. Inside a
+    batch() block saves are deferred until the block exits, unless
+    `flush_every` dirty objects or `flush_interval` seconds accumulate.
+
+    In lazy mode, reload() only indexes the raw dictionaries by key;
+    instances are built the first time all(), get() or a class query
+    touches them. If the snapshot is in the "indexed" format, the raw
+    entries are not even read: they stay in the file, mapped in memory,
+    and get() decodes the one record it needs.
+
+    With `stream` set, reload() parses the snapshot entry by entry
+    instead of loading the whole document first.
+
+    Snapshots are written to a temporary file that replaces file.json
+    once complete, so a crash never leaves a truncated database. The
+    `fsync` policy decides when writes are forced to disk: "always",
+    "periodic" (at most once every `fsync_interval` seconds, the writes
+    in between being synced by a timer at the end of the interval) or
+    "never".
+
+    With `async_writes` set, save() hands the write to a background
+    thread that folds bursts of requests into one write; flush() writes
+    synchronously and close() stops the thread. A failed background
+    write is raised by the next save(), flush() or close().
+
+    With `compact_models` set, reloaded objects use the slots-backed
+    classes of models.compact to save memory on large stores.
+
+    Secondary indexes registered with add_index() are kept in step with
+    new(), attribute updates and delete(); columns() uses this to keep
+    a ColumnStore of the numeric attributes of a class, and
+    places_near() / places_in_bbox() a GridIndex of Place coordinates
+    and find() a RelationIndex per (class, attribute) it is asked for.
+    where() answers attribute queries, using the hash or sorted indexes
+    made by create_index() when one fits and a scan otherwise.
+
+    With `sharded` set, objects are stored in one file per class under
+    file.json.d (split in `shards_per_class` files by id hash), and a
+    save only rewrites the shards holding dirty objects. reload() reads
+    the shards on `reload_workers` threads, or on `reload_processes`
+    worker processes when set, and can be limited to some classes; the
+    other classes are then loaded before a write would replace them.
+
+    Files are written in the `serializer` format ("json", "orjson" or
+    "pickle", see models.engine.serializers) and read in whichever
+    format their header announces; convert() rewrites them all. They
+    are compressed with the `compression` codec ("gzip" or "lzma"), or
+    by default with the one named by the extension of the snapshot path
+    (file.json.gz, file.json.xz).
     """
     __file_path = "file.json"
+    __journal_path = "file.json.log"
+    __shard_path = "file.json.d"
     __objects = {}
+    __by_class = {}
+    __raw = {}
+    __indexes = {}
+    __dirty = {}
+    __dirty_ids = {}
+    __journal_size = 0
+    __batch_depth = 0
+    __last_flush = 0.0
+    __last_fsync = 0.0
+    __unsynced = set()
+    __sync_timer = None
+    __reshard = False
+    __loaded = None
     __class_mapping = None
+    __lock = threading.Lock()
+    __write_lock = threading.RLock()
+    __write_requested = threading.Event()
+    __writer = None
+    __at_exit = None
+    __write_error = None
+    __closing = False
+
+    journal = os.getenv("HBNB_STORAGE_JOURNAL", "0") == "1"
+    lazy = os.getenv("HBNB_STORAGE_LAZY", "0") == "1"
+    stream = os.getenv("HBNB_STORAGE_STREAM", "0") == "1"
+    fsync = os.getenv("HBNB_STORAGE_FSYNC", "never")
+    fsync_interval = 1.0
+    async_writes = os.getenv("HBNB_STORAGE_ASYNC", "0") == "1"
+    compact_models = os.getenv("HBNB_STORAGE_COMPACT", "0") == "1"
+    sharded = os.getenv("HBNB_STORAGE_SHARDED", "0") == "1"
+    shards_per_class = int(os.getenv("HBNB_STORAGE_SHARDS", "1"))
+    serializer = os.getenv("HBNB_STORAGE_FORMAT", "json")
+    compression = os.getenv("HBNB_STORAGE_COMPRESSION") or None
+    reload_workers = 4
+    reload_processes = int(os.getenv("HBNB_STORAGE_RELOAD_PROCESSES", "0"))
+    grid_cell_size = 0.1
+    compact_every = 1000
+    flush_every = 0
+    flush_interval = 0.0
 
     @classmethod
     def _initialize_class_mapping(cls):
@@ -31,43 +147,757 @@ class FileStorage:
 
     @staticmethod
     def _get_model_classes():
-        models_module = importlib.import_module('models')
-        return {name: cls for name, cls in models_module.__dict__.items()
-                if isinstance(cls, type) and issubclass(cls, BaseModel)}
+        classes = {}
+        pending = [BaseModel]
+        while pending:
+            cls = pending.pop()
+            if "_compact_of" not in vars(cls):
+                classes[cls.__name__] = cls
+                pending.extend(cls.__subclasses__())
+        return classes
+
+    @staticmethod
+    def _key(obj):
+        """Returns the __objects key of obj: <obj class name>.id"""
+        return "{}.{}".format(obj.__class__.__name__, obj.id)
+
+    def all(self, cls=None):
+        """
+        Returns the dictionary __objects, or only the objects of cls
+        (a class or a class name) from its per-class bucket.
+        """
+        if cls is None:
+            for name in list(FileStorage.__raw):
+                self._materialize(name)
+            return FileStorage.__objects
+        name = cls if isinstance(cls, str) else cls.__name__
+        self._materialize(name)
+        return FileStorage.__by_class.get(name, {})
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id, or None"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        key = "{}.{}".format(name, id)
+        self._materialize(name, key)
+        return FileStorage.__objects.get(key)
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of cls"""
+        if cls is None:
+            return len(FileStorage.__objects) + sum(
+                len(raw) for raw in FileStorage.__raw.values())
+        name = cls if isinstance(cls, str) else cls.__name__
+        return (len(FileStorage.__by_class.get(name, {})) +
+                len(FileStorage.__raw.get(name, {})))
+
+    def _materialize(self, name, key=None):
+        """Builds the instances of raw entries of class name (or just key)"""
+        raw = FileStorage.__raw.get(name)
+        if not raw:
+            return
+        keys = list(raw) if key is None else [key] if key in raw else []
+        for key in keys:
+            value = raw.pop(key)
+            self._track(key, self._load_class(name, value)(**value))
+        if not raw:
+            del FileStorage.__raw[name]
+
+    def _track(self, key, obj):
+        """Stores obj under key in __objects and in its class bucket"""
+        FileStorage.__objects[key] = obj
+        FileStorage.__by_class.setdefault(
+            obj.__class__.__name__, {})[key] = obj
+        for index in FileStorage.__indexes.get(obj.__class__.__name__, ()):
+            index.add(key, obj)
 
-    def all(self):
-        """Returns the dictionary __objects"""
-        return FileStorage.__objects
+    def _untrack(self, key):
+        """Removes key from __objects and its class bucket"""
+        FileStorage.__raw.get(key.split('.')[0], {}).pop(key, None)
+        obj = FileStorage.__objects.pop(key, None)
+        if obj is not None:
+            FileStorage.__by_class[obj.__class__.__name__].pop(key, None)
+            for index in FileStorage.__indexes.get(
+                    obj.__class__.__name__, ()):
+                index.remove(key, obj)
+        return obj
+
+    def add_index(self, cls, index):
+        """
+        Registers index for the objects of cls and feeds it the existing
+        ones; it then receives add(key, obj), update(key, obj, name) and
+        remove(key, obj) calls as objects change.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        for key, obj in list(self.all(name).items()):
+            index.add(key, obj)
+        FileStorage.__indexes.setdefault(name, []).append(index)
+        return index
+
+    def remove_index(self, cls, index):
+        """Unregisters an index added with add_index()"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        FileStorage.__indexes.get(name, []).remove(index)
+        if not FileStorage.__indexes.get(name, True):
+            del FileStorage.__indexes[name]
+
+    def indexes(self, cls):
+        """Returns the indexes registered for cls"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        return list(FileStorage.__indexes.get(name, ()))
+
+    def columns(self, cls, fields=None):
+        """
+        Returns the ColumnStore of the numeric attributes of cls (or of
+        fields), creating and registering it on first use.
+        """
+        self._initialize_class_mapping()
+        name = cls if isinstance(cls, str) else cls.__name__
+        if fields is None:
+            fields = numeric_fields(self.__class_mapping[name])
+        for index in self.indexes(name):
+            if isinstance(index, ColumnStore) and \
+                    set(fields) <= set(index.fields):
+                return index
+        return self.add_index(name, ColumnStore(fields))
 
     def new(self, obj):
         """Sets in __objects the obj with key <obj class name>.id"""
-        key = "{}.{}".format(obj.__class__.__name__, obj.id)
-        FileStorage.__objects[key] = obj
+        key = self._key(obj)
+        FileStorage.__raw.get(obj.__class__.__name__, {}).pop(key, None)
+        self._track(key, obj)
+        with FileStorage.__lock:
+            FileStorage.__dirty[key] = obj
+            FileStorage.__dirty_ids[id(obj)] = obj
+
+    def find(self, cls, attribute, value):
+        """
+        Returns {key: obj} of the cls objects whose attribute equals value,
+        e.g. find(City, "state_id", state.id), through a reverse index.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        for index in self.indexes(name):
+            if isinstance(index, RelationIndex) and \
+                    index.attribute == attribute:
+                break
+        else:
+            index = self.add_index(name, RelationIndex(attribute))
+        return {key: FileStorage.__objects[key] for key in index.keys(value)}
+
+    def create_index(self, cls, attribute, kind="sorted"):
+        """
+        Returns the "hash" (equality) or "sorted" (equality and range)
+        index on attribute of cls, creating it if needed.
+        """
+        index_class = {"hash": RelationIndex,
+                       "sorted": query.SortedIndex}.get(kind)
+        if index_class is None:
+            raise ValueError("unknown index kind: {}".format(kind))
+        for index in self.indexes(cls):
+            if type(index) is index_class and index.attribute == attribute:
+                return index
+        return self.add_index(cls, index_class(attribute))
+
+    def where(self, cls, conditions, explain=False):
+        """
+        Returns the objects of cls matching every condition, given as
+        text ("price_by_night<100, max_guest>=4") or Condition tuples.
+        With explain, returns a description of the plan instead.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        if isinstance(conditions, str):
+            conditions = query.parse_conditions(conditions)
+        chosen = query.plan(conditions, self.indexes(name))
+        if explain:
+            return query.describe(name, conditions, chosen, self.count(name))
+        return query.select(self.all(name), conditions, chosen)
+
+    def _place_grid(self):
+        """Returns the GridIndex of Place, creating it on first use"""
+        for index in self.indexes(Place):
+            if isinstance(index, GridIndex):
+                return index
+        return self.add_index(Place, GridIndex(self.grid_cell_size))
+
+    def places_near(self, lat, lon, radius_km):
+        """Returns [(distance_km, place)] within radius_km, nearest first"""
+        return [(distance, FileStorage.__objects[key]) for distance, key
+                in self._place_grid().near(lat, lon, radius_km)]
+
+    def places_in_bbox(self, south, west, north, east):
+        """Returns the places inside the bounding box"""
+        return [FileStorage.__objects[key] for key
+                in self._place_grid().within(south, west, north, east)]
+
+    def mark_dirty(self, obj, name=None):
+        """Flags obj as modified if it is tracked by this storage"""
+        # Fast path for repeated assignments: nothing left to record
+        if id(obj) in FileStorage.__dirty_ids and \
+                type(obj).__name__ not in FileStorage.__indexes:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", None))
+        if FileStorage.__objects.get(key) is obj:
+            with FileStorage.__lock:
+                FileStorage.__dirty[key] = obj
+                FileStorage.__dirty_ids[id(obj)] = obj
+            for index in FileStorage.__indexes.get(
+                    obj.__class__.__name__, ()):
+                index.update(key, obj, name)
+
+    def is_dirty(self, obj):
+        """Returns True if obj has changes that are not on disk yet"""
+        return self._key(obj) in FileStorage.__dirty
+
+    def delete(self, obj=None):
+        """Removes obj from __objects; persisted on the next save()"""
+        if obj is None:
+            return
+        key = self._key(obj)
+        if self._untrack(key) is not None:
+            with FileStorage.__lock:
+                FileStorage.__dirty[key] = None
+                FileStorage.__dirty_ids.pop(id(obj), None)
+
+    def save(self, obj=None):
+        """
+        Serializes __objects to the JSON file (path: __file_path).
+
+        obj, when given, is the instance that changed. In journal mode
+        only the changes since the last save are appended to the log.
+        Inside a batch() block the write is deferred.
+        """
+        if obj is not None:
+            self.mark_dirty(obj)
+        self._raise_write_error()
+        if FileStorage.__batch_depth and not self._flush_due():
+            return
+        self._schedule()
+
+    def flush(self):
+        """Writes the dirty objects to disk now"""
+        self._raise_write_error()
+        self._flush()
+
+    def _raise_write_error(self):
+        """Raises the error of the last failed background write, once"""
+        with FileStorage.__lock:
+            error = FileStorage.__write_error
+            FileStorage.__write_error = None
+        if error is not None:
+            raise error
+
+    def _flush(self):
+        """Body of flush(), also run by the background writer"""
+        with FileStorage.__write_lock:
+            if not FileStorage.__dirty:
+                return
+            if self.journal:
+                self._append_journal()
+            elif self.sharded and not FileStorage.__reshard:
+                self._write_dirty_shards()
+            else:
+                self.compact()
+
+    def _schedule(self):
+        """Flushes now, or wakes the background writer in async mode"""
+        if not self.async_writes:
+            self.flush()
+            return
+        with FileStorage.__lock:
+            if FileStorage.__writer is None:
+                FileStorage.__writer = threading.Thread(
+                    target=self._write_loop, name="FileStorage writer",
+                    daemon=True)
+                FileStorage.__writer.start()
+                # Kept to unregister it from whichever instance is closed
+                FileStorage.__at_exit = self.close
+                atexit.register(FileStorage.__at_exit)
+        FileStorage.__write_requested.set()
 
-    def save(self):
-        """Serializes __objects to the JSON file (path: __file_path)"""
+    def _write_loop(self):
+        """Body of the background writer thread"""
+        while True:
+            FileStorage.__write_requested.wait()
+            FileStorage.__write_requested.clear()
+            try:
+                self._flush()
+            except Exception as error:
+                # The changes stay dirty; the caller learns of the failure
+                # from its next save() or flush(), which retries them
+                with FileStorage.__lock:
+                    FileStorage.__write_error = error
+            if FileStorage.__closing:
+                return
+
+    def close(self):
+        """Stops the background writer after a last synchronous flush"""
+        writer = FileStorage.__writer
+        if writer is not None:
+            FileStorage.__closing = True
+            FileStorage.__write_requested.set()
+            writer.join()
+            FileStorage.__writer = None
+            FileStorage.__closing = False
+            atexit.unregister(FileStorage.__at_exit)
+        self.flush()
+        self.sync_pending()
+
+    def _take_dirty(self):
+        """Hands over the dirty objects, leaving an empty set behind"""
+        with FileStorage.__lock:
+            dirty = FileStorage.__dirty
+            FileStorage.__dirty = {}
+            FileStorage.__dirty_ids = {}
+        return dirty
+
+    def _restore_dirty(self, dirty):
+        """Puts back the changes of a write that failed"""
+        with FileStorage.__lock:
+            dirty.update(FileStorage.__dirty)
+            FileStorage.__dirty = dirty
+            FileStorage.__dirty_ids = {
+                id(obj): obj for obj in dirty.values() if obj is not None}
+
+    def _flush_due(self):
+        """Tells whether a deferred batch has grown enough to be written"""
+        if self.flush_every and len(FileStorage.__dirty) >= self.flush_every:
+            return True
+        return bool(self.flush_interval) and (
+            time.monotonic() - FileStorage.__last_flush >= self.flush_interval
+        )
+
+    @contextmanager
+    def batch(self):
+        """Defers every save() in the block to a single write at its end"""
+        if not FileStorage.__batch_depth:
+            FileStorage.__last_flush = time.monotonic()
+        FileStorage.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            FileStorage.__batch_depth -= 1
+            if not FileStorage.__batch_depth:
+                self._schedule()
+
+    def compact(self):
+        """Writes a full snapshot and discards the journal"""
+        with FileStorage.__write_lock:
+            self._load_missing()
+            dirty = self._take_dirty()
+            try:
+                self._write_snapshot()
+            except BaseException:
+                self._restore_dirty(dirty)
+                raise
+            FileStorage.__last_flush = time.monotonic()
+            if os.path.exists(FileStorage.__journal_path):
+                os.remove(FileStorage.__journal_path)
+            FileStorage.__journal_size = 0
+
+    def convert(self, serializer):
+        """Rewrites the snapshot or every shard in the serializer format"""
+        serializers.get(serializer)
+        with FileStorage.__write_lock:
+            FileStorage.serializer = serializer
+            self.compact()
+
+    def _write_snapshot(self):
+        """Serializes every object to file.json, or to every shard"""
+        if self.sharded:
+            self._write_shards()
+            FileStorage.__reshard = False
+            return
         serialized_objects = {}
-        for key, obj in FileStorage.__objects.items():
+        # Copies first: the writer thread may run alongside mutations
+        for raw in list(FileStorage.__raw.values()):
+            serialized_objects.update(raw)
+        for key, obj in list(FileStorage.__objects.items()):
             serialized_objects[key] = obj.to_dict()
+        if self._write_file(FileStorage.__file_path, serialized_objects):
+            self._sync_directory(FileStorage.__file_path)
+
+    def _write_file(self, path, serialized_objects):
+        """
+        Writes serialized_objects to a temporary file renamed over path.
+        Returns True if the fsync policy synced it.
+        """
+        serializer = serializers.get(self.serializer)
+        temp_path = path + ".tmp"
+        with open(temp_path, mode="wb") as file:
+            with compression.writer(file, self._compression()) as stream:
+                serializer.dump(serialized_objects, stream)
+            synced = self._sync(file, path)
+        os.replace(temp_path, path)
+        return synced
+
+    def _compression(self):
+        """Returns the codec of the files written, None for no compression"""
+        if self.compression is not None:
+            return self.compression
+        return compression.from_path(FileStorage.__file_path)
 
-        with open(FileStorage.__file_path, mode="w", encoding="utf-8") as file:
-            json.dump(serialized_objects, file)
+    def _shard_name(self, key):
+        """Returns the name of the shard file holding key"""
+        class_name, obj_id = key.split('.')
+        suffix = ".json" + compression.extension(self._compression())
+        if self.shards_per_class <= 1:
+            return class_name + suffix
+        # crc32 rather than hash(): string hashes change between runs
+        return "{}.{}{}".format(
+            class_name, zlib.crc32(obj_id.encode()) % self.shards_per_class,
+            suffix)
 
-    def reload(self):
-        """Deserializes the JSON file to __objects"""
+    def _is_current_shard(self, name):
+        """
+        Tells whether the shard file name fits shards_per_class and the
+        compression codec
+        """
+        suffix = ".json" + compression.extension(self._compression())
+        if not name.endswith(suffix):
+            return False
+        parts = name[:-len(suffix)].split('.')
+        if self.shards_per_class <= 1:
+            return len(parts) == 1
+        return (len(parts) == 2 and parts[1].isdigit() and
+                int(parts[1]) < self.shards_per_class)
+
+    @staticmethod
+    def _shard_files():
+        """Returns {name: path} of the shard files on disk"""
+        try:
+            names = os.listdir(FileStorage.__shard_path)
+        except FileNotFoundError:
+            return {}
+        suffixes = (".json",) + tuple(
+            ".json" + suffix for suffix, _ in compression.CODECS.values())
+        return {name: os.path.join(FileStorage.__shard_path, name)
+                for name in names if name.endswith(suffixes)}
+
+    def _write_dirty_shards(self):
+        """Rewrites only the shards holding dirty objects"""
+        with FileStorage.__lock:
+            classes = {key.split('.')[0] for key in FileStorage.__dirty}
+        self._load_missing(classes)
+        dirty = self._take_dirty()
+        try:
+            self._write_shards({self._shard_name(key) for key in dirty})
+        except BaseException:
+            self._restore_dirty(dirty)
+            raise
+        FileStorage.__last_flush = time.monotonic()
+
+    def _write_shards(self, names=None):
+        """
+        Rewrites the shard files in names, or all of them (removing the
+        ones left over from another layout) if names is None. Shards
+        left without objects are removed.
+        """
+        if names is None:
+            classes = set(FileStorage.__raw) | set(FileStorage.__by_class)
+        else:
+            names = set(names)
+            classes = {name.split('.')[0] for name in names}
+        shards = {}
+        for class_name in classes:
+            # Copies first: the writer thread may run alongside mutations
+            for key, value in list(FileStorage.__raw.get(
+                    class_name, {}).items()):
+                name = self._shard_name(key)
+                if names is None or name in names:
+                    shards.setdefault(name, {})[key] = value
+            # Only the objects of the shards written are serialized
+            for key, obj in list(FileStorage.__by_class.get(
+                    class_name, {}).items()):
+                name = self._shard_name(key)
+                if names is None or name in names:
+                    shards.setdefault(name, {})[key] = obj.to_dict()
+
+        os.makedirs(FileStorage.__shard_path, exist_ok=True)
+        existing = self._shard_files()
+        if names is None:
+            names = set(shards) | set(existing)
+        synced = False
+        for name in names:
+            path = os.path.join(FileStorage.__shard_path, name)
+            if name in shards:
+                synced = self._write_file(path, shards[name]) or synced
+            elif name in existing:
+                os.remove(path)
+        if synced:
+            self._sync_directory(path)
+
+    def _append_journal(self):
+        """Appends one record per dirty object to the journal"""
+        dirty = self._take_dirty()
         try:
             with open(
-                FileStorage.__file_path, mode="r", encoding="utf-8"
+                FileStorage.__journal_path, mode="a", encoding="utf-8"
             ) as file:
-                deserialized_objects = json.load(file)
-                self._initialize_class_mapping()
-                for key, value in deserialized_objects.items():
-                    class_name, obj_id = key.split('.')
-                    cls = self.__class_mapping.get(class_name)
-                    if cls:
-                        obj = cls(**value)
-                        FileStorage.__objects[key] = obj
+                for key, obj in dirty.items():
+                    value = obj.to_dict() if obj is not None else None
+                    file.write(
+                        json.dumps({"key": key, "value": value}) + "\n")
+                self._sync(file)
+        except BaseException:
+            self._restore_dirty(dirty)
+            raise
+        FileStorage.__journal_size += len(dirty)
+        FileStorage.__last_flush = time.monotonic()
+        if FileStorage.__journal_size >= self.compact_every:
+            self.compact()
+
+    def _sync(self, file, path=None):
+        """
+        Forces file to disk if the fsync policy asks for it now. A write
+        the periodic policy skips is synced by a timer once the interval
+        is over; path is then the name the file will have by that time.
+        """
+        if self.fsync not in ("always", "periodic", "never"):
+            raise ValueError("unknown fsync policy: {}".format(self.fsync))
+        now = time.monotonic()
+        if self.fsync == "never":
+            return False
+        if self.fsync == "periodic" and \
+                now - FileStorage.__last_fsync < self.fsync_interval:
+            with FileStorage.__lock:
+                FileStorage.__unsynced.add(path or file.name)
+                if FileStorage.__sync_timer is None:
+                    FileStorage.__sync_timer = threading.Timer(
+                        FileStorage.__last_fsync + self.fsync_interval - now,
+                        self.sync_pending)
+                    FileStorage.__sync_timer.daemon = True
+                    FileStorage.__sync_timer.start()
+            return False
+        file.flush()
+        os.fsync(file.fileno())
+        FileStorage.__last_fsync = now
+        return True
+
+    def sync_pending(self):
+        """Forces to disk the files written since the last periodic sync"""
+        with FileStorage.__lock:
+            paths = FileStorage.__unsynced
+            FileStorage.__unsynced = set()
+            timer = FileStorage.__sync_timer
+            FileStorage.__sync_timer = None
+        if timer is not None:
+            timer.cancel()
+        for path in paths:
+            try:
+                descriptor = os.open(path, os.O_RDONLY)
+            except OSError:
+                # Removed since, e.g. a journal folded into the snapshot
+                continue
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+            self._sync_directory(path)
+        if paths:
+            FileStorage.__last_fsync = time.monotonic()
+
+    @staticmethod
+    def _sync_directory(path):
+        """Makes the renames of files next to path durable"""
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            descriptor = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+    def _load_class(self, name, value=None):
+        """
+        Returns the class used to build reloaded objects of name, or the
+        one fitting the attributes of value in compact mode
+        """
+        cls = self.__class_mapping.get(name)
+        if cls is not None and self.compact_models:
+            return compact_class(cls, value)
+        return cls
+
+    def _load(self, key, value):
+        """Builds the object described by value and stores it under key"""
+        class_name, obj_id = key.split('.')
+        cls = self._load_class(class_name, value)
+        if not cls:
+            return
+        if self.lazy and not FileStorage.__indexes.get(class_name):
+            self._untrack(key)
+            FileStorage.__raw.setdefault(class_name, {})[key] = value
+        else:
+            if class_name in FileStorage.__raw:
+                FileStorage.__raw[class_name].pop(key, None)
+            self._track(key, cls(**value))
+
+    def reload(self, classes=None, processes=True):
+        """
+        Deserializes the JSON file (or the shards), then replays the
+        journal. classes, a list of classes or class names, limits the
+        loading to their objects. processes=False parses the shards on
+        threads even if reload_processes is set.
+        """
+        self._initialize_class_mapping()
+        if classes is not None:
+            classes = {cls if isinstance(cls, str) else cls.__name__
+                       for cls in classes}
+        FileStorage.__loaded = classes
+        if self.sharded and os.path.isdir(FileStorage.__shard_path):
+            self._load_shards(classes, processes)
+        else:
+            try:
+                with open(FileStorage.__file_path, mode="rb") as file:
+                    # Moving to shards: the next save writes all of them
+                    FileStorage.__reshard = self.sharded
+                    if self.lazy and can_map(file):
+                        self._map(classes)
                     else:
-                        return
+                        for key, value in self._read(file):
+                            if classes is None or \
+                                    key.split('.')[0] in classes:
+                                self._load(key, value)
+            except FileNotFoundError:
+                pass
+        self._replay_journal(classes)
+
+    def _map(self, classes):
+        """
+        Makes the raw entries of lazy mode views over the records of the
+        indexed snapshot, mapped in memory rather than read
+        """
+        snapshot = MappedSnapshot(FileStorage.__file_path)
+        for name in snapshot.classes():
+            if (classes is not None and name not in classes) or \
+                    not self._load_class(name):
+                continue
+            view = snapshot.view(name)
+            for key in list(FileStorage.__by_class.get(name, {})):
+                if key in view:
+                    self._untrack(key)
+            previous = FileStorage.__raw.get(name, {})
+            FileStorage.__raw[name] = view
+            for key in list(previous):
+                if key not in view:
+                    view[key] = previous[key]
+            if FileStorage.__indexes.get(name):
+                self._materialize(name)
+
+    def _read(self, file):
+        """Returns the (key, value) pairs of a binary snapshot or shard"""
+        file = compression.reader(file)
+        serializer = serializers.detect(file)
+        if self.stream and isinstance(serializer,
+                                      serializers.JSONSerializer):
+            return iter_items(io.TextIOWrapper(file, encoding="utf-8"))
+        return serializer.load(file).items()
+
+    def _load_shards(self, classes, processes=True):
+        """
+        Loads the shards of classes (all if None). The files are parsed
+        on threads, or in worker processes to use several cores; the
+        objects are then built and indexed here.
+        """
+        files = self._shard_files()
+        if not all(self._is_current_shard(name) for name in files):
+            FileStorage.__reshard = True
+        paths = [path for name, path in sorted(files.items())
+                 if classes is None or name.split('.')[0] in classes]
+        if self.stream:
+            # Holding whole parsed shards would defeat streaming
+            for path in paths:
+                with open(path, mode="rb") as file:
+                    for key, value in self._read(file):
+                        self._load(key, value)
+            return
+        if processes and self.reload_processes and len(paths) > 1:
+            executor = ProcessPoolExecutor(max_workers=self.reload_processes)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.reload_workers)
+        with executor:
+            for items in executor.map(_parse_shard, paths):
+                for key, value in items:
+                    self._load(key, value)
+
+    def _replay_journal(self, classes=None):
+        """Applies the journal records on top of the loaded snapshot"""
+        records = self._read_journal()
+        FileStorage.__journal_size = len(records)
+        for record in records:
+            if classes is not None and \
+                    record["key"].split('.')[0] not in classes:
+                continue
+            if record["value"] is None:
+                self._untrack(record["key"])
+            else:
+                self._load(record["key"], record["value"])
+
+    @staticmethod
+    def _read_journal():
+        """
+        Returns the records of the journal. A torn record at its tail is
+        cut off, so that the next ones are not appended to it.
+        """
+        records = []
+        try:
+            with open(FileStorage.__journal_path, mode="r+b") as file:
+                end = 0
+                for line in file:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated record")
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # Torn write at the tail of the log, stop here
+                        file.truncate(end)
+                        break
+                    end += len(line)
         except FileNotFoundError:
             pass
+        return records
+
+    def _load_missing(self, classes=None):
+        """
+        Loads the objects of classes (all if None) that the last reload
+        left on disk, so that writing their file does not drop them.
+        Objects in memory and deletions not written yet are kept.
+        """
+        if FileStorage.__loaded is None:
+            return
+        self._initialize_class_mapping()
+
+        def missing(key):
+            name = key.split('.')[0]
+            return name not in FileStorage.__loaded and \
+                (classes is None or name in classes)
+
+        on_disk = {}
+        if self.sharded and os.path.isdir(FileStorage.__shard_path):
+            for name, path in sorted(self._shard_files().items()):
+                if missing(name):
+                    on_disk.update(_parse_shard(path))
+        else:
+            try:
+                with open(FileStorage.__file_path, mode="rb") as file:
+                    for key, value in self._read(file):
+                        if missing(key):
+                            on_disk[key] = value
+            except FileNotFoundError:
+                pass
+        for record in self._read_journal():
+            if missing(record["key"]):
+                on_disk[record["key"]] = record["value"]
+
+        for key, value in on_disk.items():
+            name = key.split('.')[0]
+            if value is not None and key not in FileStorage.__objects and \
+                    key not in FileStorage.__dirty and \
+                    key not in FileStorage.__raw.get(name, {}):
+                self._load(key, value)
+        if classes is None:
+            FileStorage.__loaded = None
+        else:
+            FileStorage.__loaded = FileStorage.__loaded | set(classes)
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Module for the GridIndex class.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Returns the great-circle distance between two points in km"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) *
+         math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    Spatial index of objects with `latitude` and `longitude` attributes.
+
+    The globe is cut in square cells of cell_size degrees; each cell
+    holds the keys of the objects located in it, so a query only visits
+    the cells overlapping its area. Objects whose coordinates are not
+    numbers within range are left out.
+    """
+
+    def __init__(self, cell_size=0.1):
+        """Initializes an empty grid of cell_size degrees"""
+        self.cell_size = cell_size
+        self.__lon_cells = math.ceil(360 / cell_size)
+        self.__lat_cells = math.ceil(180 / cell_size)
+        self.__cells = {}
+        self.__positions = {}
+
+    def __len__(self):
+        """Returns the number of indexed objects"""
+        return len(self.__positions)
+
+    def _cell(self, lat, lon):
+        """Returns the cell holding the point"""
+        return (min(int((lon + 180) // self.cell_size), self.__lon_cells - 1),
+                min(int((lat + 90) // self.cell_size), self.__lat_cells - 1))
+
+    @staticmethod
+    def _position(obj):
+        """Returns (lat, lon) of obj, or None if they are not usable"""
+        try:
+            lat, lon = float(obj.latitude), float(obj.longitude)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon
+        return None
+
+    def add(self, key, obj):
+        """Indexes obj under key"""
+        self.remove(key)
+        position = self._position(obj)
+        if position is None:
+            return
+        cell = self._cell(*position)
+        self.__cells.setdefault(cell, set()).add(key)
+        self.__positions[key] = position + (cell,)
+
+    def update(self, key, obj, name=None):
+        """Moves obj if its coordinates changed"""
+        if name in (None, "latitude", "longitude"):
+            self.add(key, obj)
+
+    def remove(self, key, obj=None):
+        """Drops key from the index"""
+        entry = self.__positions.pop(key, None)
+        if entry is not None:
+            cell = self.__cells[entry[2]]
+            cell.discard(key)
+            if not cell:
+                del self.__cells[entry[2]]
+
+    def _columns(self, start, end):
+        """
+        Returns the set of cell columns covering the longitudes start to
+        end, counted in degrees east of -180 and clipped to 360
+        """
+        return set(range(int(start // self.cell_size),
+                         min(int(end // self.cell_size),
+                             self.__lon_cells - 1) + 1))
+
+    def _keys_in(self, south, west, north, east):
+        """
+        Yields (key, lat, lon) in the cells covering the box, where
+        west <= east but either may lie outside [-180, 180].
+        """
+        south, north = max(south, -90), min(north, 90)
+        if south > north:
+            return
+        lat_range = range(self._cell(south, 0)[1], self._cell(north, 0)[1] + 1)
+        span = east - west
+        if span >= 360:
+            columns = range(self.__lon_cells)
+        else:
+            # Wrapped in degrees: the last column may be narrower than
+            # cell_size, so wrapping column numbers would shift the cells
+            start = (west + 180) % 360
+            columns = self._columns(start, start + span)
+            if start + span >= 360:
+                columns |= self._columns(0, start + span - 360)
+        if len(columns) * len(lat_range) > len(self.__cells):
+            # Cheaper to walk the occupied cells than the covered ones
+            cells = self.__cells.values()
+        else:
+            cells = (self.__cells.get((x, y))
+                     for x in columns for y in lat_range)
+        for keys in cells:
+            for key in keys or ():
+                lat, lon, _ = self.__positions[key]
+                yield key, lat, lon
+
+    def within(self, south, west, north, east):
+        """
+        Returns the keys located in the bounding box; west may be greater
+        than east for boxes crossing the antimeridian.
+        """
+        crosses = west > east
+        return [key for key, lat, lon in self._keys_in(
+                    south, west, north, east + 360 if crosses else east)
+                if south <= lat <= north and
+                (west <= lon or lon <= east if crosses
+                 else west <= lon <= east)]
+
+    def near(self, lat, lon, radius_km):
+        """Returns [(distance_km, key)] within radius_km, nearest first"""
+        lat_delta = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(abs(lat) + lat_delta, 90)))
+        if cos_lat < 1e-9 or lat_delta * 2 >= 180:
+            lon_delta = 180
+        else:
+            lon_delta = min(lat_delta / cos_lat, 180)
+        found = []
+        for key, key_lat, key_lon in self._keys_in(
+                lat - lat_delta, lon - lon_delta,
+                lat + lat_delta, lon + lon_delta):
+            distance = haversine_km(lat, lon, key_lat, key_lon)
+            if distance <= radius_km:
+                found.append((distance, key))
+        found.sort()
+        return found
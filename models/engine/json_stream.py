@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Incremental parsing of the top-level JSON object of a storage file.
+"""
+
+import json
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+
+
+def iter_items(file, chunk_size=CHUNK_SIZE):
+    """
+    Yields the (key, value) pairs of the JSON object stored in file.
+
+    The file is read chunk_size characters at a time and each value is
+    decoded as soon as it is complete, so only one chunk and the value
+    being decoded are held in memory besides what the caller keeps.
+    Raises json.JSONDecodeError if the document is not a JSON object.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        """Appends the next chunk to the buffer; False at end of file"""
+        nonlocal buf, pos, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf, pos = buf[pos:] + chunk, 0
+        return True
+
+    def peek():
+        """Skips whitespace and returns the next character ('' at EOF)"""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return buf[pos:pos + 1]
+
+    def expect(chars):
+        """Consumes the next character, which must be one of chars"""
+        nonlocal pos
+        char = peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                "Expecting {!r}".format(" or ".join(chars)), buf, pos)
+        pos += 1
+        return char
+
+    def decode():
+        """Decodes the complete JSON value starting at pos"""
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A value ending with the buffer may continue in the file,
+                # and so may a number followed by the start of a fraction
+                # or exponent ("1." then "5", "1e" then "3")
+                rest = end
+                if isinstance(value, (int, float)) and \
+                        not isinstance(value, bool):
+                    while rest < len(buf) and buf[rest] in NUMBER_CHARS:
+                        rest += 1
+                if rest < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    expect("{")
+    if peek() == "}":
+        pos += 1
+    else:
+        while True:
+            if peek() != '"':
+                raise json.JSONDecodeError(
+                    "Expecting property name enclosed in double quotes",
+                    buf, pos)
+            key = decode()
+            expect(":")
+            yield key, decode()
+            if expect(",}") == "}":
+                break
+    if peek():
+        raise json.JSONDecodeError("Extra data", buf, pos)
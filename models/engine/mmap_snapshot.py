@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""
+Random access to the records of an "indexed" snapshot through mmap.
+
+The index at the end of the file is sorted by key and made of fixed
+size entries, so a key is found by binary search and only its record
+is decoded; neither the other records nor the index are loaded in
+memory, and the pages the system reads can be evicted at any time.
+"""
+
+import mmap
+from collections.abc import MutableMapping
+from models.engine.serializers import (INDEX_MAGIC, SERIALIZERS, TRAILER,
+                                       header, index_entry, loads)
+
+HEADER = header(SERIALIZERS["indexed"])
+
+
+def can_map(file):
+    """Tells whether the buffered file is an uncompressed indexed snapshot"""
+    return file.peek(len(HEADER)).startswith(HEADER)
+
+
+class MappedSnapshot:
+    """Read-only view of the records of an indexed snapshot file."""
+
+    def __init__(self, path):
+        """Maps the snapshot at path; raises ValueError if it is invalid"""
+        with open(path, mode="rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__map[:len(HEADER)] != HEADER or \
+                len(self.__map) < len(HEADER) + TRAILER.size:
+            raise ValueError("not an indexed snapshot: {}".format(path))
+        self.__index, self.__count, self.__width, magic = \
+            TRAILER.unpack_from(self.__map, len(self.__map) - TRAILER.size)
+        if magic != INDEX_MAGIC:
+            raise ValueError("truncated indexed snapshot: {}".format(path))
+        self.__entry = index_entry(self.__width)
+
+    def __len__(self):
+        """Returns the number of records"""
+        return self.__count
+
+    def _entry(self, i):
+        """Returns (padded key, offset, length) of index entry i"""
+        return self.__entry.unpack_from(
+            self.__map, self.__index + i * self.__entry.size)
+
+    def _bisect(self, key, lo=0, hi=None):
+        """Returns the first entry whose key is not less than key (bytes)"""
+        key = key.ljust(self.__width, b"\0")
+        hi = self.__count if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key, lo=0, hi=None):
+        """Returns the entry number of key, or None"""
+        encoded = key.encode()
+        i = self._bisect(encoded, lo, hi)
+        if i < (self.__count if hi is None else hi) and \
+                self._entry(i)[0].rstrip(b"\0") == encoded:
+            return i
+        return None
+
+    def key(self, i):
+        """Returns the key of entry i"""
+        return self._entry(i)[0].rstrip(b"\0").decode()
+
+    def value(self, i):
+        """Decodes the record of entry i"""
+        _, offset, length = self._entry(i)
+        return loads(self.__map[offset:offset + length])
+
+    def get(self, key):
+        """Decodes the record of key, or returns None"""
+        i = self.find(key)
+        return None if i is None else self.value(i)
+
+    def range(self, prefix):
+        """Returns (start, stop) of the entries whose key starts with prefix"""
+        encoded = prefix.encode()
+        following = encoded[:-1] + bytes([encoded[-1] + 1])
+        start = self._bisect(encoded)
+        return start, self._bisect(following, start)
+
+    def classes(self):
+        """Returns the class names present, with one search per class"""
+        names = []
+        i = 0
+        while i < self.__count:
+            names.append(self.key(i).split('.')[0])
+            i = self.range(names[-1] + ".")[1]
+        return names
+
+    def view(self, class_name):
+        """Returns a SnapshotView of the records of class_name"""
+        return SnapshotView(self, *self.range(class_name + "."))
+
+
+class SnapshotView(MutableMapping):
+    """
+    {key: record} mapping over the records of one class in a snapshot.
+
+    Records are decoded when read. Deleting a key hides it and setting
+    one stores the new value in memory, leaving the file untouched.
+    """
+
+    def __init__(self, snapshot, start, stop):
+        """Wraps the entries start to stop of snapshot"""
+        self.__snapshot = snapshot
+        self.__start = start
+        self.__stop = stop
+        self.__removed = set()
+        self.__added = {}
+
+    def _find(self, key):
+        """Returns the entry of key if it is visible, else None"""
+        if key in self.__removed:
+            return None
+        return self.__snapshot.find(key, self.__start, self.__stop)
+
+    def __contains__(self, key):
+        """Tells whether key has a record, without decoding it"""
+        return key in self.__added or self._find(key) is not None
+
+    def __getitem__(self, key):
+        """Returns the record of key"""
+        if key in self.__added:
+            return self.__added[key]
+        i = self._find(key)
+        if i is None:
+            raise KeyError(key)
+        return self.__snapshot.value(i)
+
+    def __setitem__(self, key, value):
+        """Stores value in memory, hiding the record on file"""
+        if self._find(key) is not None:
+            self.__removed.add(key)
+        self.__added[key] = value
+
+    def __delitem__(self, key):
+        """Hides the record of key"""
+        if key in self.__added:
+            del self.__added[key]
+        elif self._find(key) is not None:
+            self.__removed.add(key)
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        """Yields the visible keys, the ones on file first"""
+        for i in range(self.__start, self.__stop):
+            key = self.__snapshot.key(i)
+            if key not in self.__removed:
+                yield key
+        yield from list(self.__added)
+
+    def __len__(self):
+        """Returns the number of visible records"""
+        return (self.__stop - self.__start - len(self.__removed) +
+                len(self.__added))
@@ -0,0 +1,206 @@
+#!/usr/bin/python3
+"""
+Attribute queries over storage: condition parsing, sorted indexes and
+the planner choosing between an index lookup and a full scan.
+"""
+
+import re
+import json
+import operator
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from models.engine.relation_index import RelationIndex
+
+OPERATORS = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+_CONDITION = re.compile(
+    r"""\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*("(?:[^"\\]|\\.)*"|'[^']*'|[^,]*?)"""
+    r"""\s*(,|$)""")
+
+
+class Condition(namedtuple("Condition", "attribute operator value")):
+    """One `attribute operator value` test, e.g. max_guest >= 4."""
+
+    def matches(self, obj):
+        """Tells whether obj satisfies the condition"""
+        try:
+            return OPERATORS[self.operator](
+                getattr(obj, self.attribute, None), self.value)
+        except TypeError:
+            return False
+
+    def __str__(self):
+        """Returns the condition as it would be written"""
+        return "{} {} {}".format(self.attribute, self.operator,
+                                 json.dumps(self.value))
+
+
+def parse_value(text):
+    """Returns the JSON value of text, or text itself without quotes"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text.strip("'")
+
+
+def parse_conditions(text):
+    """
+    Parses "price_by_night<100, max_guest>=4" into Condition objects.
+    Raises ValueError on malformed input.
+    """
+    conditions = []
+    position = 0
+    while position < len(text):
+        match = _CONDITION.match(text, position)
+        if match is None or not match.group(3):
+            raise ValueError("invalid condition: {}".format(
+                text[position:].strip()))
+        attribute, op, value = match.group(1, 2, 3)
+        conditions.append(Condition(attribute, op, parse_value(value)))
+        position = match.end()
+        if not match.group(4):
+            break
+    if not conditions and text.strip():
+        raise ValueError("invalid condition: {}".format(text.strip()))
+    return conditions
+
+
+def _rank(value):
+    """
+    Groups values that can be ordered together: numbers (bools included,
+    as they compare like 0 and 1), then strings. NaN compares false with
+    everything, so it is left out like other values.
+    """
+    if isinstance(value, (int, float)):
+        return 0 if value == value else None
+    if isinstance(value, str):
+        return 1
+    return None
+
+
+class SortedIndex:
+    """
+    Ordered index on one attribute answering equality and range tests.
+
+    Entries are kept sorted as (rank, value, key) so that numbers and
+    strings never get compared with each other; other values are not
+    indexed.
+    """
+
+    def __init__(self, attribute):
+        """Initializes an empty index on attribute"""
+        self.attribute = attribute
+        self.__entries = []
+        self.__values = {}
+
+    def __len__(self):
+        """Returns the number of indexed keys"""
+        return len(self.__values)
+
+    def add(self, key, obj):
+        """Indexes obj under key"""
+        self.remove(key)
+        value = getattr(obj, self.attribute, None)
+        rank = _rank(value)
+        if rank is not None:
+            insort(self.__entries, (rank, value, key))
+            self.__values[key] = (rank, value)
+
+    def update(self, key, obj, name=None):
+        """Reindexes obj if the indexed attribute changed"""
+        if name is None or name == self.attribute:
+            self.add(key, obj)
+
+    def remove(self, key, obj=None):
+        """Drops key from the index"""
+        entry = self.__values.pop(key, None)
+        if entry is not None:
+            del self.__entries[bisect_left(self.__entries, entry + (key,))]
+
+    def supports(self, condition):
+        """Tells whether keys() can answer condition"""
+        return (condition.operator != "!=" and
+                _rank(condition.value) is not None)
+
+    def keys(self, condition):
+        """Returns the keys matching a supported condition"""
+        rank, value = _rank(condition.value), condition.value
+        op = condition.operator
+        # Keys are strings, so "" sorts before any key and "\uffff" after
+        low = (rank, value, "") if op in ("==", "=", ">=") else \
+            (rank, value, "\uffff") if op == ">" else (rank,)
+        high = (rank, value, "\uffff") if op in ("==", "=", "<=") else \
+            (rank, value, "") if op == "<" else (rank + 1,)
+        start = bisect_left(self.__entries, low)
+        end = bisect_right(self.__entries, high)
+        return [entry[2] for entry in self.__entries[start:end]]
+
+
+def _hashable(value):
+    """Tells whether value can be looked up in a hash index"""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def plan(conditions, indexes):
+    """
+    Returns (index, condition) for the index lookup to start from, or
+    None for a full scan. Hash lookups are preferred, then equality on
+    a sorted index, then ranges.
+    """
+    best, best_score = None, None
+    for condition in conditions:
+        equality = condition.operator in ("==", "=")
+        for index in indexes:
+            # Other indexes (grids, column stores) have no attribute
+            if not isinstance(index, (RelationIndex, SortedIndex)) or \
+                    index.attribute != condition.attribute:
+                continue
+            if isinstance(index, RelationIndex) and equality and \
+                    _hashable(condition.value):
+                score = 0
+            elif isinstance(index, SortedIndex) and index.supports(condition):
+                score = 1 if equality else 2
+            else:
+                continue
+            if best_score is None or score < best_score:
+                best, best_score = (index, condition), score
+    return best
+
+
+def describe(cls_name, conditions, chosen, count):
+    """Returns the text printed by explain for a plan"""
+    if chosen is None:
+        text = "full scan of {} ({} objects)".format(cls_name, count)
+        rest = conditions
+    else:
+        index, condition = chosen
+        kind = "hash" if isinstance(index, RelationIndex) else "sorted"
+        text = "{} index on {}.{} for {}".format(
+            kind, cls_name, index.attribute, condition)
+        rest = [other for other in conditions if other is not condition]
+    if rest:
+        text += ", then filter on " + " and ".join(map(str, rest))
+    return text
+
+
+def select(objects, conditions, chosen):
+    """Returns the objects matching every condition following the plan"""
+    if chosen is None:
+        candidates = objects.values()
+    else:
+        index, condition = chosen
+        if isinstance(index, RelationIndex):
+            keys = index.keys(condition.value)
+        else:
+            keys = index.keys(condition)
+        candidates = [objects[key] for key in keys if key in objects]
+    # The index condition is checked again, in case an indexed value
+    # changed behind the index's back
+    return [obj for obj in candidates
+            if all(condition.matches(obj) for condition in conditions)]
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Module for the RelationIndex class.
+"""
+
+
+class RelationIndex:
+    """
+    Reverse index from the value of one attribute to the keys holding it.
+
+    Used for foreign keys such as Place.city_id: keys(city.id) returns
+    the keys of the places of that city without scanning every place.
+    """
+
+    def __init__(self, attribute):
+        """Initializes an empty index on attribute"""
+        self.attribute = attribute
+        self.__keys = {}
+        self.__values = {}
+
+    def keys(self, value):
+        """Returns the set of keys whose attribute equals value"""
+        return self.__keys.get(value, set())
+
+    def add(self, key, obj):
+        """Indexes obj under key"""
+        self.remove(key)
+        value = getattr(obj, self.attribute, None)
+        try:
+            self.__keys.setdefault(value, set()).add(key)
+        except TypeError:
+            # Unhashable values (lists, dicts) cannot be looked up
+            return
+        self.__values[key] = value
+
+    def update(self, key, obj, name=None):
+        """Reindexes obj if the indexed attribute changed"""
+        if name is None or name == self.attribute:
+            self.add(key, obj)
+
+    def remove(self, key, obj=None):
+        """Drops key from the index"""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        keys = self.__keys[value]
+        keys.discard(key)
+        if not keys:
+            del self.__keys[value]
@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+"""
+File formats of the storage snapshots and shards.
+
+"json" is the historical format and has no header. Binary formats
+start with a one-line header, b"HBNB/<format>/<version>\n", which
+load() uses to pick the right decoder, so a store can be reloaded
+whatever format it was written in. "orjson" writes plain JSON with the
+orjson package, falling back to the json module when it is missing.
+"indexed" stores one JSON record per object followed by a sorted index
+of the keys, so that models.engine.mmap_snapshot can read one record
+without parsing the others.
+"""
+
+import io
+import json
+import pickle
+import struct
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HEADER_PREFIX = b"HBNB/"
+# Footer of indexed files: index offset, entry count, key width, magic
+TRAILER = struct.Struct("<QQI8s")
+INDEX_MAGIC = b"HBNBIDX1"
+
+
+def loads(data):
+    """Decodes JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def index_entry(width):
+    """Returns the struct of an index entry: padded key, offset, length"""
+    return struct.Struct("<{}sQI".format(width))
+
+
+class JSONSerializer:
+    """Plain JSON, read with orjson when it is installed."""
+    name = "json"
+    version = None
+
+    def dump(self, objects, file):
+        """Writes objects to the binary file"""
+        text = io.TextIOWrapper(file, encoding="utf-8")
+        json.dump(objects, text)
+        text.flush()
+        text.detach()
+
+    def load(self, file):
+        """Reads the objects from the binary file"""
+        return loads(file.read())
+
+
+class OrjsonSerializer(JSONSerializer):
+    """JSON written with orjson, or with the json module as a fallback."""
+    name = "orjson"
+
+    def dump(self, objects, file):
+        """Writes objects to the binary file"""
+        if orjson is None:
+            super().dump(objects, file)
+        else:
+            file.write(orjson.dumps(objects))
+
+
+class PickleSerializer:
+    """Pickle protocol 5; only load stores written by a trusted party."""
+    name = "pickle"
+    version = 1
+
+    def dump(self, objects, file):
+        """Writes objects to the binary file, after the header"""
+        file.write(header(self))
+        pickle.dump(objects, file, protocol=5)
+
+    def load(self, file):
+        """Reads the objects from the binary file, past the header"""
+        return pickle.load(file)
+
+
+class IndexedSerializer:
+    """
+    JSON records sorted by key, then an index of fixed size entries
+    (key, offset, length) in the same order and the TRAILER.
+    """
+    name = "indexed"
+    version = 1
+
+    def dump(self, objects, file):
+        """Writes objects to the binary file, after the header"""
+        head = header(self)
+        file.write(head)
+        offset = len(head)
+        entries = []
+        # Code point order is also the UTF-8 byte order of the index
+        for key in sorted(objects):
+            data = json.dumps(objects[key], separators=(",", ":")).encode()
+            file.write(data)
+            entries.append((key.encode(), offset, len(data)))
+            offset += len(data)
+        width = max((len(key) for key, _, _ in entries), default=0)
+        entry = index_entry(width)
+        for key, position, length in entries:
+            file.write(entry.pack(key, position, length))
+        file.write(TRAILER.pack(offset, len(entries), width, INDEX_MAGIC))
+
+    def load(self, file):
+        """Reads every record from the binary file, past the header"""
+        data = file.read()
+        base = len(header(self))
+        if len(data) < TRAILER.size:
+            raise ValueError("truncated indexed snapshot")
+        index_offset, count, width, magic = TRAILER.unpack_from(
+            data, len(data) - TRAILER.size)
+        if magic != INDEX_MAGIC:
+            raise ValueError("truncated indexed snapshot")
+        entry = index_entry(width)
+        objects = {}
+        for position in range(index_offset - base,
+                              index_offset - base + count * entry.size,
+                              entry.size):
+            key, offset, length = entry.unpack_from(data, position)
+            offset -= base
+            objects[key.rstrip(b"\0").decode()] = loads(
+                data[offset:offset + length])
+        return objects
+
+
+SERIALIZERS = {serializer.name: serializer for serializer in (
+    JSONSerializer(), OrjsonSerializer(), PickleSerializer(),
+    IndexedSerializer())}
+
+
+def header(serializer):
+    """Returns the header line written before the data of serializer"""
+    return HEADER_PREFIX + "{}/{}\n".format(
+        serializer.name, serializer.version).encode()
+
+
+def get(name):
+    """Returns the serializer called name; raises ValueError if unknown"""
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError("unknown format: {}".format(name)) from None
+
+
+def detect(file):
+    """
+    Returns the serializer of the buffered binary file, consuming its
+    header if it has one. Raises ValueError for unknown headers.
+    """
+    if not file.peek(len(HEADER_PREFIX)).startswith(HEADER_PREFIX):
+        return SERIALIZERS["json"]
+    line = file.readline()
+    serializer = SERIALIZERS.get(line[len(HEADER_PREFIX):].split(b"/")[0]
+                                 .decode("ascii", "replace"))
+    if serializer is None or line != header(serializer):
+        raise ValueError("unsupported storage format: {!r}".format(line))
+    return serializer
+
+
+def load(file):
+    """Returns the objects stored in the binary file, in any format"""
+    return detect(file).load(file)
@@ -3,7 +3,9 @@
 Module inherits from BaseModel class.
 """
 
+import models
 from models.base_model import BaseModel
+from models.review import Review
 
 
 class Place(BaseModel):
@@ -19,3 +21,8 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def reviews(self):
+        """List of the Review instances with place_id equal to this id"""
+        return list(models.storage.find(Review, "place_id", self.id).values())
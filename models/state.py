@@ -3,9 +3,16 @@
 Module inherits from BaseModel class.
 """
 
+import models
 from models.base_model import BaseModel
+from models.city import City
 
 
 class State(BaseModel):
     """State class that inherits from BaseModel"""
     name = ""
+
+    @property
+    def cities(self):
+        """List of the City instances with state_id equal to this id"""
+        return list(models.storage.find(City, "state_id", self.id).values())
@@ -3,7 +3,10 @@
 Module for the User class which inherits from BaseModel.
 """
 
+import models
 from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
 
 
 class User(BaseModel):
@@ -20,3 +23,13 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """List of the Place instances with user_id equal to this id"""
+        return list(models.storage.find(Place, "user_id", self.id).values())
+
+    @property
+    def reviews(self):
+        """List of the Review instances with user_id equal to this id"""
+        return list(models.storage.find(Review, "user_id", self.id).values())
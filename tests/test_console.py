@@ -3,17 +3,57 @@
 Unit test cases for the HBNBCommand console.
 """
 
+import os
+import json
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch
 from io import StringIO
-from console import HBNBCommand
+import console
+from console import DotCommand, HBNBCommand, parse_dot_command
+from models import storage
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.user import User
 
 
 class TestConsole(unittest.TestCase):
 
     def setUp(self):
-        """Set up the HBNBCommand instance for testing."""
+        """Set up the HBNBCommand instance on an empty temporary storage."""
         self.hbnb_cmd = HBNBCommand()
+        self.directory = tempfile.mkdtemp()
+        self.paths = {}
+        for name in ("file_path", "journal_path", "shard_path"):
+            attribute = "_FileStorage__" + name
+            self.paths[attribute] = getattr(FileStorage, attribute)
+            setattr(FileStorage, attribute, os.path.join(
+                self.directory, os.path.basename(self.paths[attribute])))
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def tearDown(self):
+        """Clean up the temporary storage and reload the real one."""
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage.save()
+        for attribute, path in self.paths.items():
+            setattr(FileStorage, attribute, path)
+        storage.reload()
+        shutil.rmtree(self.directory)
+
+    def db_output(self, command):
+        """Run command on a DBStorage and return what it printed."""
+        db = DBStorage(os.path.join(self.directory, "hbnb.db"))
+        db.reload()
+        try:
+            with patch("console.storage", db), \
+                    patch('sys.stdout', new=StringIO()) as mock_stdout:
+                self.hbnb_cmd.onecmd(command)
+        finally:
+            db.close()
+        return mock_stdout.getvalue().strip()
 
     def test_create_command(self):
         """Test the create command."""
@@ -122,6 +162,264 @@ class TestConsole(unittest.TestCase):
             output = mock_stdout.getvalue().strip()
             self.assertIn("** no instance found **", output)
 
+    def test_count_command(self):
+        """Test the <class>.count() command."""
+        with patch('sys.stdout', new=StringIO()):
+            self.hbnb_cmd.onecmd("create User")
+            self.hbnb_cmd.onecmd("create User")
+            self.hbnb_cmd.onecmd("create State")
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("User.count()")
+            self.assertEqual(mock_stdout.getvalue().strip(), "2")
+
+    def test_show_object_not_created_by_console(self):
+        """Test that show finds objects that only live in storage."""
+        user = User()
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd(f"show User {user.id}")
+            self.assertIn(user.id, mock_stdout.getvalue())
+
+    def test_destroy_removes_from_storage(self):
+        """Test that destroy deletes the instance from storage."""
+        user = User()
+        user.save()
+        with patch('sys.stdout', new=StringIO()):
+            self.hbnb_cmd.onecmd(f"destroy User {user.id}")
+        self.assertIsNone(storage.get(User, user.id))
+        self.assertNotIn(f"User.{user.id}", storage.all())
+
+    def test_near_command(self):
+        """Test the near command."""
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("create Place")
+            place_id = mock_stdout.getvalue().strip()
+        place = storage.get("Place", place_id)
+        place.latitude, place.longitude = 40.7128, -74.0060
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("near 40.71 -74.00 5")
+            self.assertIn(place_id, mock_stdout.getvalue())
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("near 40.71")
+            self.assertEqual(mock_stdout.getvalue().strip(),
+                             "** coordinates missing **")
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("near a b c")
+            self.assertEqual(mock_stdout.getvalue().strip(),
+                             "** invalid coordinates **")
+        self.assertEqual(self.db_output("near 40.71 -74.00 5"),
+                         "** not supported by this storage **")
+
+    def test_where_and_explain_commands(self):
+        """Test the <class>.where(), explain() and index() commands."""
+        user = User()
+        user.first_name = "Betty"
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd('User.where(first_name="Betty")')
+            self.assertIn(user.id, mock_stdout.getvalue())
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd('User.index(first_name, hash)')
+            self.hbnb_cmd.onecmd('User.explain(first_name="Betty")')
+            storage.remove_index(
+                User, storage.create_index(User, "first_name", "hash"))
+            self.assertEqual(mock_stdout.getvalue().strip(),
+                             'hash index on User.first_name for '
+                             'first_name = "Betty"')
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd('User.where(first_name)')
+            self.assertEqual(mock_stdout.getvalue().strip(),
+                             "** invalid condition: first_name **")
+        for command in ("Place.where(max_guest>1)",
+                        "Place.explain(max_guest>1)",
+                        "Place.index(max_guest)"):
+            self.assertEqual(self.db_output(command),
+                             "** not supported by this storage **")
+
+    def test_convert_command(self):
+        """Test the convert command."""
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("convert")
+            self.hbnb_cmd.onecmd("convert xml")
+            self.assertEqual(mock_stdout.getvalue(),
+                             "** format name missing **\n"
+                             "** unknown format: xml **\n")
+        with patch.object(storage, "convert") as mock_convert:
+            self.hbnb_cmd.onecmd("convert pickle")
+            mock_convert.assert_called_once_with("pickle")
+        self.assertEqual(self.db_output("convert pickle"),
+                         "** not supported by this storage **")
+
+    def test_run_batch(self):
+        """Test that batch mode writes the changes once."""
+        commands = StringIO("create User\n\ncreate User\nUser.count()\n"
+                            "quit\ncreate User\n")
+        with patch.object(storage, "flush", wraps=storage.flush) as flush, \
+                patch('sys.stdout', new=StringIO()) as mock_stdout:
+            count = self.hbnb_cmd.run_batch(commands)
+        self.assertEqual(count, 4)
+        self.assertEqual(flush.call_count, 1)
+        self.assertEqual(mock_stdout.getvalue().splitlines()[2], "2")
+        self.assertEqual(storage.count("User"), 2)
+
+    def test_main_batch_file(self):
+        """Test console.py --batch <file>."""
+        path = "test_commands.txt"
+        with open(path, "w") as file:
+            file.write("create State\nState.count()\n")
+        try:
+            with patch('sys.stdout', new=StringIO()) as mock_stdout, \
+                    patch('sys.stderr', new=StringIO()) as mock_stderr:
+                self.assertEqual(console.main(["--batch", path]), 0)
+        finally:
+            os.remove(path)
+        self.assertEqual(mock_stdout.getvalue().splitlines()[1], "1")
+        self.assertRegex(mock_stderr.getvalue(),
+                         r"^2 commands in [\d.]+s \([\d,]+ commands/s\)")
+        with patch('sys.stderr', new=StringIO()) as mock_stderr:
+            self.assertEqual(console.main(["--batch", path]), 1)
+            self.assertEqual(console.main(["--batch"]), 2)
+
+    def test_create_many_command(self):
+        """Test that create_many creates and saves n instances at once."""
+        with patch.object(storage, "flush", wraps=storage.flush) as flush, \
+                patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("create_many User 5")
+        ids = mock_stdout.getvalue().split()
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(flush.call_count, 1)
+        for instance_id in ids:
+            self.assertIsNotNone(storage.get("User", instance_id))
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("create_many User")
+            self.hbnb_cmd.onecmd("create_many User -2")
+            self.hbnb_cmd.onecmd("create_many Foo 2")
+            self.assertEqual(mock_stdout.getvalue(),
+                             "** count missing **\n** invalid count **\n"
+                             "** class doesn't exist **\n")
+
+    def test_update_many_command(self):
+        """Test updating instances from a JSON lines stream."""
+        betty, john = User(), User()
+        lines = StringIO(
+            '{"%s": {"first_name": "Betty", "age": 30}}\n'
+            '\n'
+            '{"%s": {"first_name": "John", "id": "other"}, "nope": {}}\n'
+            'not json\n' % (betty.id, john.id))
+        with patch.object(storage, "flush", wraps=storage.flush) as flush, \
+                patch('sys.stdin', new=lines), \
+                patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("update_many User -")
+        self.assertEqual(mock_stdout.getvalue().splitlines(), [
+            betty.id, john.id, "** no instance found: nope **",
+            "** invalid update on line 4 **"])
+        self.assertEqual(flush.call_count, 1)
+        self.assertEqual((betty.first_name, betty.age), ("Betty", 30))
+        self.assertEqual(john.first_name, "John")
+        self.assertIs(storage.get("User", john.id), john)
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("update_many User")
+            self.hbnb_cmd.onecmd("update_many User missing.jsonl")
+            self.assertEqual(mock_stdout.getvalue(),
+                             "** file name missing **\n** cannot read "
+                             "missing.jsonl: No such file or directory **\n")
+
+    def test_all_output_unchanged(self):
+        """Test that the streamed list prints like the list repr."""
+        users = [User() for _ in range(3)]
+        users[0].first_name = "O'Hara"
+        for command, objects in (("all", storage.all()),
+                                 ("all User", storage.all(User)),
+                                 ("all State", {})):
+            with patch('sys.stdout', new=StringIO()) as mock_stdout:
+                self.hbnb_cmd.onecmd(command)
+            self.assertEqual(mock_stdout.getvalue(), "{}\n".format(
+                [str(value) for value in objects.values()]))
+
+    def test_all_streaming_modes(self):
+        """Test the --lines, --json and pagination options of all."""
+        users = [User() for _ in range(5)]
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("all User --lines")
+        self.assertEqual(mock_stdout.getvalue().splitlines(),
+                         [str(user) for user in users])
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("all User --json --offset=1 --limit=1")
+        self.assertEqual(json.loads(mock_stdout.getvalue()),
+                         users[1].to_dict())
+
+        with patch('sys.stdout', new=StringIO()) as mock_stdout, \
+                patch('sys.stderr', new=StringIO()) as mock_stderr:
+            self.hbnb_cmd.onecmd("all User --lines --limit=2")
+            cursor = mock_stderr.getvalue().split()[-1]
+            self.assertEqual(cursor, "--after=2:User." + users[1].id)
+            self.hbnb_cmd.onecmd("all User --lines --limit=3 " + cursor)
+            self.assertEqual(mock_stdout.getvalue().splitlines(),
+                             [str(user) for user in users])
+            self.assertEqual(mock_stderr.getvalue().count("next page"), 1)
+
+        with patch('sys.stdout', new=StringIO()) as mock_stdout, \
+                patch('sys.stderr', new=StringIO()) as mock_stderr:
+            self.hbnb_cmd.onecmd("all User --lines --offset=1 --limit=1 " +
+                                 cursor)
+            self.assertEqual(mock_stdout.getvalue(), str(users[3]) + "\n")
+            self.assertEqual(mock_stderr.getvalue(),
+                             "next page: --after=4:User.{}\n".format(
+                                 users[3].id))
+
+        # Objects removed before the cursor shift it: the key is looked up
+        storage.delete(users[0])
+        for after in (cursor, "--after=User." + users[1].id):
+            with patch('sys.stdout', new=StringIO()) as mock_stdout:
+                self.hbnb_cmd.onecmd("all User --lines " + after)
+            self.assertEqual(mock_stdout.getvalue().splitlines(),
+                             [str(user) for user in users[2:]])
+
+        storage.delete(users[1])
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("all User --lines --limit=3 " + cursor)
+        self.assertEqual(mock_stdout.getvalue(), "** invalid cursor **\n")
+
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("all User --limit=x")
+            self.hbnb_cmd.onecmd("all User --csv")
+            self.assertEqual(mock_stdout.getvalue(),
+                             "** invalid option: --limit=x **\n"
+                             "** invalid option: --csv **\n")
+
+    def test_parse_dot_command(self):
+        """Test the parsing of dot notation commands."""
+        self.assertEqual(parse_dot_command('User.show("1234")'),
+                         DotCommand("User", "show", "_dot_show", ("1234",)))
+        self.assertEqual(
+            parse_dot_command('User.update("1234", {"age": 3})'),
+            DotCommand("User", "update", "_dot_update_dict",
+                       ("1234", '{"age": 3}')))
+        self.assertEqual(
+            parse_dot_command('User.update("1234", "age", 3)').args,
+            ("1234", "age", 3))
+        self.assertEqual(parse_dot_command("User.index(name, 'hash')").args,
+                         ("name", "hash"))
+        self.assertIsNone(parse_dot_command("User.show"))
+        self.assertIsNone(parse_dot_command("User.fly()").handler)
+        self.assertIsNone(parse_dot_command("User.show(1234-abc)").args)
+        self.assertEqual(parse_dot_command("User.count()").args, ())
+        self.assertEqual(parse_dot_command('User.show("12\\"34")').args,
+                         ('12"34',))
+        self.assertEqual(parse_dot_command('User.show("12", "34")').args,
+                         ("12", "34"))
+
+    def test_dot_command_errors(self):
+        """Test the messages of invalid dot notation commands."""
+        with patch('sys.stdout', new=StringIO()) as mock_stdout:
+            self.hbnb_cmd.onecmd("User.fly()")
+            self.hbnb_cmd.onecmd("Foo.count()")
+            self.hbnb_cmd.onecmd("User.show(1234-abc)")
+            self.hbnb_cmd.onecmd("User.update(\"1234\")")
+            self.assertEqual(mock_stdout.getvalue(),
+                             "*** Unknown command: fly\n"
+                             "** class doesn't exist **\n"
+                             "*** Unknown syntax: User.show(1234-abc)\n"
+                             "** instance id missing **\n")
+
 
 if __name__ == '__main__':
     unittest.main()
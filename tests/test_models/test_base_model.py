@@ -100,6 +100,14 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_model.created_at, self.model.created_at)
         self.assertEqual(new_model.updated_at, datetime(2022, 1, 2, 15, 30, 0))
 
+    def test_from_dict_method_without_microseconds(self):
+        """Test from_dict with timestamps that have no microseconds."""
+        model_dict = self.model.to_dict()
+        model_dict['created_at'] = "2022-01-01T12:00:00"
+        new_model = BaseModel(**model_dict)
+        self.assertEqual(new_model.created_at, datetime(2022, 1, 1, 12, 0, 0))
+        self.assertNotIn('__class__', new_model.__dict__)
+
     def test_save_method_calls_storage_save(self):
         """Test that the save method calls the save method of the storage."""
         with unittest.mock.patch('models.storage.save') as mock_save:
@@ -5,6 +5,7 @@ Contains unit test cases for the City class.
 
 import unittest
 from models.city import City
+from models.place import Place
 from models.base_model import BaseModel
 
 
@@ -67,6 +68,13 @@ class TestCity(unittest.TestCase):
         self.assertTrue(hasattr(city, 'custom_attribute'))
         self.assertEqual(city.custom_attribute, "custom_value")
 
+    def test_places(self):
+        """Test that places lists the places of the city."""
+        city = City()
+        place = Place()
+        place.city_id = city.id
+        self.assertEqual(city.places, [place])
+
 
 if __name__ == '__main__':
     unittest.main()
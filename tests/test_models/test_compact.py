@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the compact model classes.
+"""
+
+import unittest
+from models.compact import compact_class, is_compact
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+class TestCompactClass(unittest.TestCase):
+    """Test cases for compact_class."""
+
+    def setUp(self):
+        """Build a compact Place from the dictionary of a regular one."""
+        self.place = Place()
+        self.place.name = "Loft"
+        self.compact = compact_class(Place)(**self.place.to_dict())
+
+    def test_is_model_class(self):
+        """Test that the compact class passes for the original one."""
+        self.assertIsInstance(self.compact, Place)
+        self.assertEqual(type(self.compact).__name__, "Place")
+        self.assertIs(compact_class(Place), type(self.compact))
+        self.assertTrue(is_compact(self.compact))
+        self.assertFalse(is_compact(self.place))
+
+    def test_same_representation(self):
+        """Test that str() and to_dict() match the regular instance."""
+        self.assertEqual(self.compact.to_dict(), self.place.to_dict())
+        self.assertEqual(str(self.compact), str(self.place))
+
+    def test_declared_attributes_use_slots(self):
+        """Test that declared attributes live in slots, with defaults."""
+        self.assertEqual(self.compact.number_rooms, 0)
+        self.assertEqual(self.compact.amenity_ids, [])
+        self.compact.number_rooms = 3
+        self.assertEqual(self.compact.number_rooms, 3)
+        self.assertNotIn("number_rooms", self.compact.__dict__)
+        self.assertIn("number_rooms", self.compact.to_dict())
+        del self.compact.number_rooms
+        self.assertEqual(self.compact.number_rooms, 0)
+
+    def test_overflow_attributes(self):
+        """Test that undeclared attributes go to the instance dict."""
+        self.compact.nickname = "cozy"
+        self.assertEqual(self.compact.__dict__, {"nickname": "cozy"})
+        self.assertEqual(self.compact.to_dict()["nickname"], "cozy")
+
+    def test_overflow_from_dictionary(self):
+        """Test that undeclared keys of the dictionary are kept."""
+        review = compact_class(Review)(**dict(Review().to_dict(), stars=5))
+        self.assertEqual(review.stars, 5)
+        self.assertEqual(review.to_dict()["stars"], 5)
+
+    def test_slots_only_set_attributes(self):
+        """Test that only the declared attributes set get a slot."""
+        values = self.place.to_dict()
+        compact = compact_class(Place, values)(**values)
+        self.assertIs(compact_class(Place, dict(values)), type(compact))
+        self.assertIn("name", type(compact).__slots__)
+        self.assertNotIn("description", type(compact).__slots__)
+        self.assertLess(len(type(compact).__slots__),
+                        len(compact_class(Place).__slots__))
+        self.assertEqual(compact.to_dict(), values)
+        self.assertEqual(compact.description, "")
+        compact.description = "Sunny"
+        self.assertEqual(compact.description, "Sunny")
+        self.assertEqual(compact.to_dict()["description"], "Sunny")
+        self.assertIsInstance(compact, Place)
+
+    def test_compact_class_is_idempotent(self):
+        """Test that compacting a compact class returns it unchanged."""
+        compact_user = compact_class(User)
+        self.assertIs(compact_class(compact_user), compact_user)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the LRUCache class.
+"""
+
+import unittest
+from models.engine.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the LRUCache class."""
+
+    def test_eviction_order(self):
+        """Test that the least recently used entry is evicted first."""
+        evicted = []
+        cache = LRUCache(2, lambda key, obj: evicted.append((key, obj)))
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(evicted, [("b", 2)])
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.peek("a"), 1)
+        cache.put("d", 4)
+        self.assertEqual(evicted, [("b", 2), ("a", 1)])
+
+    def test_counters(self):
+        """Test the hit, miss and eviction counters."""
+        cache = LRUCache(1)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.peek("b")
+        cache.put("b", 2)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1,
+                                         "evictions": 1, "size": 1,
+                                         "capacity": 1})
+
+    def test_unbounded(self):
+        """Test that a capacity of 0 never evicts."""
+        cache = LRUCache(0, lambda key, obj: self.fail("evicted"))
+        for i in range(100):
+            cache.put(i, str(i))
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(cache.pop(5), "5")
+        self.assertIsNone(cache.pop(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the ColumnStore class.
+"""
+
+import unittest
+import math
+import random
+from models.engine.columnar import ColumnStore, numeric_fields
+from models.place import Place
+
+
+class TestColumnStore(unittest.TestCase):
+    """Test cases for the ColumnStore class."""
+
+    def setUp(self):
+        """Fill a store with a few places."""
+        self.store = ColumnStore(("price_by_night", "max_guest"))
+        self.places = {}
+        for price, guests in ((50, 2), (120, 4), (80, 6), (200, 8)):
+            place = Place()
+            place.price_by_night = price
+            place.max_guest = guests
+            key = "Place." + place.id
+            self.places[key] = place
+            self.store.add(key, place)
+
+    def key(self, price):
+        """Return the key of the place with the given price."""
+        return next(key for key, place in self.places.items()
+                    if place.price_by_night == price)
+
+    def test_numeric_fields(self):
+        """Test the detection of numeric class attributes."""
+        self.assertEqual(set(numeric_fields(Place)), {
+            "number_rooms", "number_bathrooms", "max_guest",
+            "price_by_night", "latitude", "longitude"})
+
+    def test_aggregates(self):
+        """Test min, max, mean, sum and count."""
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self.store.min("price_by_night"), 50)
+        self.assertEqual(self.store.max("price_by_night"), 200)
+        self.assertEqual(self.store.mean("price_by_night"), 112.5)
+        self.assertEqual(self.store.sum("max_guest"), 20)
+        self.assertEqual(self.store.mean("price_by_night", max_guest=(4, 6)),
+                         100)
+        self.assertIsNone(
+            self.store.min("price_by_night", max_guest=(9, None)))
+
+    def test_filter(self):
+        """Test range filters, bounds included."""
+        self.assertEqual(
+            set(self.store.filter(price_by_night=(None, 100),
+                                  max_guest=(4, None))),
+            {self.key(80)})
+        self.assertEqual(self.store.count(price_by_night=(80, 120)), 2)
+
+    def test_update_and_remove(self):
+        """Test that rows follow updates and removals."""
+        key = self.key(50)
+        place = self.places[key]
+        place.price_by_night = 500
+        self.store.update(key, place, "price_by_night")
+        self.assertEqual(self.store.max("price_by_night"), 500)
+
+        self.store.remove(self.key(120))
+        self.store.remove(key)
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(set(self.store.filter()),
+                         {self.key(80), self.key(200)})
+        self.assertEqual(self.store.sum("max_guest"), 14)
+
+    def test_non_numeric_values(self):
+        """Test that invalid values are stored as NaN and ignored."""
+        key = self.key(200)
+        self.places[key].price_by_night = "expensive"
+        self.store.update(key, self.places[key])
+        self.assertTrue(math.isnan(self.store.column("price_by_night")[
+            self.store.keys.index(key)]))
+        self.assertEqual(self.store.max("price_by_night"), 120)
+        self.assertNotIn(key, self.store.filter(price_by_night=(0, None)))
+
+    def test_filter_follows_changes(self):
+        """Test filters against a scan after random changes."""
+        random.seed(0)
+        self.store.filter(price_by_night=(None, None), max_guest=(0, 0))
+        for _ in range(500):
+            action = random.random()
+            if action < 0.4 or not self.places:
+                place = Place()
+                key = "Place." + place.id
+                self.places[key] = place
+            else:
+                key = random.choice(list(self.places))
+                place = self.places[key]
+            if action < 0.8:
+                place.price_by_night = random.choice((random.randint(0, 9),
+                                                      "free"))
+                place.max_guest = random.randint(0, 5)
+                self.store.update(key, place)
+            else:
+                del self.places[key]
+                self.store.remove(key)
+            low, high = sorted(random.sample(range(10), 2))
+            self.assertCountEqual(
+                self.store.filter(price_by_night=(low, high),
+                                  max_guest=(None, 3)),
+                [key for key, place in self.places.items()
+                 if place.price_by_night in range(low, high + 1) and
+                 place.max_guest <= 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the compression module.
+"""
+
+import io
+import unittest
+from models.engine import compression
+
+DATA = b'{"User.1": {"id": "1"}}' * 100
+
+
+def compress(name):
+    """Returns a buffered reader over DATA compressed with name."""
+    buffer = io.BytesIO()
+    with compression.writer(buffer, name) as stream:
+        stream.write(DATA)
+    return io.BufferedReader(io.BytesIO(buffer.getvalue()))
+
+
+class TestCompression(unittest.TestCase):
+    """Test cases for the storage compression codecs."""
+
+    def test_round_trip(self):
+        """Test that reader() recognizes and decompresses every codec."""
+        for name in (None, "gzip", "lzma"):
+            file = compress(name)
+            if name is not None:
+                self.assertLess(len(file.peek()), len(DATA), name)
+            self.assertEqual(compression.reader(file).read(), DATA, name)
+
+    def test_gzip_is_reproducible(self):
+        """Test that equal data gives equal gzip files."""
+        self.assertEqual(compress("gzip").read(), compress("gzip").read())
+
+    def test_from_path(self):
+        """Test the choice of codec by file extension."""
+        self.assertEqual(compression.from_path("file.json.gz"), "gzip")
+        self.assertEqual(compression.from_path("file.json.xz"), "lzma")
+        self.assertIsNone(compression.from_path("file.json"))
+
+    def test_unknown_codec(self):
+        """Test that an unknown codec raises ValueError."""
+        with self.assertRaises(ValueError):
+            compression.writer(io.BytesIO(), "zstd")
+
+
+if __name__ == '__main__':
+    unittest.main()
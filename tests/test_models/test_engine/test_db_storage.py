@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the DBStorage class.
+"""
+
+import unittest
+import os
+import sqlite3
+from models.user import User
+from models.place import Place
+from models.review import Review
+from models.engine.db_storage import DBStorage
+
+
+class TestDBStorage(unittest.TestCase):
+    """Test cases for the DBStorage class."""
+
+    path = "test_hbnb.db"
+
+    def setUp(self):
+        """Open a fresh database for each test."""
+        self.storage = DBStorage(self.path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """Close and remove the database after each test."""
+        self.storage.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def reopen(self):
+        """Close the database and open it again from disk."""
+        self.storage.close()
+        self.storage = DBStorage(self.path)
+        self.storage.reload()
+
+    def test_save_and_reload(self):
+        """Test that saved objects come back after reopening."""
+        user = User()
+        user.email = "betty@holberton.io"
+        self.storage.new(user)
+        self.storage.save()
+        self.reopen()
+
+        reloaded = self.storage.get(User, user.id)
+        self.assertIsInstance(reloaded, User)
+        self.assertEqual(reloaded.email, "betty@holberton.io")
+        self.assertEqual(reloaded.created_at, user.created_at)
+
+    def test_all(self):
+        """Test all() with and without a class."""
+        user = User()
+        place = Place()
+        self.storage.new(user)
+        self.storage.new(place)
+        self.storage.save()
+        self.reopen()
+
+        self.assertIn("User." + user.id, self.storage.all())
+        self.assertIn("Place." + place.id, self.storage.all())
+        self.assertEqual(list(self.storage.all("Place")),
+                         ["Place." + place.id])
+
+    def test_unsaved_objects_are_listed(self):
+        """Test that new objects are visible before save()."""
+        user = User()
+        self.storage.new(user)
+        self.assertIn("User." + user.id, self.storage.all(User))
+        self.assertIs(self.storage.get("User", user.id), user)
+
+    def test_count(self):
+        """Test count() with and without a class."""
+        for obj in (User(), User(), Place()):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.count(User), 2)
+        self.assertEqual(self.storage.count(), 3)
+
+    def test_delete(self):
+        """Test that delete() removes the row on save()."""
+        user = User()
+        self.storage.new(user)
+        self.storage.save()
+        self.storage.delete(user)
+        self.storage.save()
+        self.reopen()
+        self.assertIsNone(self.storage.get(User, user.id))
+
+    def test_find_by_foreign_key(self):
+        """Test indexed lookups by foreign key."""
+        place = Place()
+        place.city_id = "city-1"
+        other = Place()
+        other.city_id = "city-2"
+        review = Review()
+        review.place_id = place.id
+        for obj in (place, other, review):
+            self.storage.new(obj)
+        self.storage.save()
+
+        self.assertEqual(list(self.storage.find(Place, "city_id", "city-1")),
+                         ["Place." + place.id])
+        self.assertEqual(list(self.storage.find(Review, "place_id", place.id)),
+                         ["Review." + review.id])
+        with self.assertRaises(ValueError):
+            self.storage.find(Place, "name", "x")
+
+    def test_foreign_key_indexes(self):
+        """Test that the foreign key columns are indexed."""
+        connection = sqlite3.connect(self.path)
+        indexes = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        connection.close()
+        for index in ("idx_Place_city_id", "idx_Review_place_id",
+                      "idx_City_state_id"):
+            self.assertIn(index, indexes)
+
+    def test_batch(self):
+        """Test that a batch is committed once at the end."""
+        with self.storage.batch():
+            user = User()
+            self.storage.new(user)
+            self.storage.save()
+            self.assertTrue(self.storage.is_dirty(user))
+        self.assertFalse(self.storage.is_dirty(user))
+
+    def test_cache_writes_back_evicted_objects(self):
+        """Test that a bounded cache writes dirty objects it evicts."""
+        self.storage.cache_size = 2
+        self.storage.reload()
+        users = [User() for _ in range(3)]
+        with self.storage.batch():
+            for user in users:
+                self.storage.new(user)
+            self.assertFalse(self.storage.is_dirty(users[0]))
+            self.assertTrue(self.storage.is_dirty(users[2]))
+        self.assertEqual(self.storage.cache_stats()["evictions"], 1)
+        self.assertEqual(self.storage.cache_stats()["size"], 2)
+        self.assertEqual(self.storage.count(User), 3)
+
+        # users[0] was evicted but is still in use: no copy is made
+        self.assertIs(self.storage.get(User, users[0].id), users[0])
+        users[1].email = "betty@holberton.io"
+        self.storage.save(users[1])
+        self.reopen()
+        self.assertEqual(self.storage.get(User, users[1].id).email,
+                         "betty@holberton.io")
+        self.assertEqual(self.storage.cache_stats()["misses"], 1)
+        self.storage.get(User, users[1].id)
+        self.assertEqual(self.storage.cache_stats()["hits"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,9 +6,18 @@ Contains the unit test cases for the FileStorage class.
 import unittest
 import os
 import json
+import time
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
 from models.base_model import BaseModel
 from models.user import User
+from models.state import State
+from models.place import Place
 from models.engine.file_storage import FileStorage
+from models.engine.mmap_snapshot import MappedSnapshot
 
 
 class TestFileStorage(unittest.TestCase):
@@ -20,8 +29,29 @@ class TestFileStorage(unittest.TestCase):
 
     def tearDown(self):
         """Clean up the file.json after each test."""
-        if os.path.exists(FileStorage._FileStorage__file_path):
-            os.remove(FileStorage._FileStorage__file_path)
+        FileStorage.journal = False
+        FileStorage.compact_every = 1000
+        FileStorage.flush_every = 0
+        FileStorage.lazy = False
+        FileStorage.stream = False
+        FileStorage.fsync = "never"
+        FileStorage._FileStorage__write_error = None
+        self.file_storage.close()
+        FileStorage.async_writes = False
+        FileStorage.compact_models = False
+        FileStorage.sharded = False
+        FileStorage.shards_per_class = 1
+        FileStorage.reload_processes = 0
+        FileStorage.serializer = "json"
+        FileStorage.compression = None
+        FileStorage._FileStorage__reshard = False
+        FileStorage._FileStorage__loaded = None
+        shutil.rmtree(FileStorage._FileStorage__shard_path, ignore_errors=True)
+        for path in (FileStorage._FileStorage__file_path,
+                     FileStorage._FileStorage__file_path + ".tmp",
+                     FileStorage._FileStorage__journal_path):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_new(self):
         """Test if new() adds the object to __objects."""
@@ -136,6 +166,625 @@ class TestFileStorage(unittest.TestCase):
         with self.assertRaises(json.JSONDecodeError):
             self.file_storage.reload()
 
+    def test_journal_appends_only_changes(self):
+        """Test that save() in journal mode appends the changed object."""
+        FileStorage.journal = True
+        self.file_storage.compact()
+        user = User()
+        user.save()
+        user.first_name = "Betty"
+        user.save()
+
+        with open(FileStorage._FileStorage__journal_path) as file:
+            records = [json.loads(line) for line in file]
+        key = "User.{}".format(user.id)
+        self.assertEqual([record["key"] for record in records], [key, key])
+        self.assertEqual(records[-1]["value"]["first_name"], "Betty")
+
+    def test_journal_reload_replays_log(self):
+        """Test that reload() replays updates and tombstones."""
+        FileStorage.journal = True
+        self.file_storage.compact()
+        user = User()
+        doomed = User()
+        self.file_storage.save()
+        user.first_name = "Holberton"
+        user.save()
+        self.file_storage.delete(doomed)
+        self.file_storage.save()
+
+        FileStorage._FileStorage__objects.clear()
+        self.file_storage.reload()
+        objects = self.file_storage.all()
+        self.assertEqual(objects["User." + user.id].first_name, "Holberton")
+        self.assertNotIn("User." + doomed.id, objects)
+
+    def test_journal_ignores_torn_tail(self):
+        """Test that a partially written last record is skipped."""
+        FileStorage.journal = True
+        self.file_storage.compact()
+        user = User()
+        user.save()
+        with open(FileStorage._FileStorage__journal_path, "a") as file:
+            file.write('{"key": "User.torn", "val')
+
+        FileStorage._FileStorage__objects.clear()
+        self.file_storage.reload()
+        self.assertIn("User." + user.id, self.file_storage.all())
+
+        later = [User(), User()]
+        for obj in later:
+            obj.save()
+        FileStorage._FileStorage__objects.clear()
+        self.file_storage.reload()
+        for obj in [user] + later:
+            self.assertIn("User." + obj.id, self.file_storage.all())
+
+    def test_journal_compaction(self):
+        """Test that the journal is folded into the snapshot."""
+        FileStorage.journal = True
+        FileStorage.compact_every = 2
+        self.file_storage.compact()
+        User().save()
+        self.assertTrue(
+            os.path.exists(FileStorage._FileStorage__journal_path))
+        User().save()
+        self.assertFalse(
+            os.path.exists(FileStorage._FileStorage__journal_path))
+        with open(FileStorage._FileStorage__file_path) as file:
+            self.assertEqual(len(json.load(file)),
+                             len(self.file_storage.all()))
+
+    def test_mutation_marks_dirty(self):
+        """Test that new objects and attribute changes are tracked."""
+        user = User()
+        self.assertTrue(self.file_storage.is_dirty(user))
+        self.file_storage.save()
+        self.assertFalse(self.file_storage.is_dirty(user))
+        user.email = "betty@holberton.io"
+        self.assertTrue(self.file_storage.is_dirty(user))
+        user.first_name = "Betty"
+        self.file_storage.save()
+        self.assertFalse(self.file_storage.is_dirty(user))
+        user.last_name = "Holberton"
+        self.assertTrue(self.file_storage.is_dirty(user))
+
+    def test_batch_defers_writes(self):
+        """Test that saves inside batch() are written once at the end."""
+        path = FileStorage._FileStorage__file_path
+        with self.file_storage.batch():
+            users = [User() for _ in range(3)]
+            for user in users:
+                user.save()
+            self.assertFalse(os.path.exists(path))
+        with open(path) as file:
+            saved = json.load(file)
+        for user in users:
+            self.assertIn("User." + user.id, saved)
+
+    def test_batch_flush_every(self):
+        """Test that a batch is flushed early past the dirty threshold."""
+        FileStorage.flush_every = 2
+        path = FileStorage._FileStorage__file_path
+        self.file_storage.save()
+        if os.path.exists(path):
+            os.remove(path)
+        with self.file_storage.batch():
+            User().save()
+            self.assertFalse(os.path.exists(path))
+            User().save()
+            self.assertTrue(os.path.exists(path))
+
+    def test_all_by_class(self):
+        """Test that all(cls) only returns the objects of cls."""
+        user = User()
+        base_model = BaseModel()
+        by_class = self.file_storage.all(User)
+        self.assertIn("User." + user.id, by_class)
+        self.assertNotIn("BaseModel." + base_model.id, by_class)
+        self.assertIs(by_class, self.file_storage.all("User"))
+        self.assertEqual(self.file_storage.all("Unknown"), {})
+
+    def test_all_by_class_after_delete_and_reload(self):
+        """Test that the class buckets follow delete() and reload()."""
+        user = User()
+        self.file_storage.save()
+        self.file_storage.delete(user)
+        self.assertNotIn("User." + user.id, self.file_storage.all(User))
+
+        self.file_storage.reload()
+        self.assertIn("User." + user.id, self.file_storage.all(User))
+
+    def test_lazy_reload_defers_construction(self):
+        """Test that lazy reload builds instances on first access."""
+        user = User()
+        base_model = BaseModel()
+        self.file_storage.save()
+        FileStorage.lazy = True
+        self.file_storage.reload()
+
+        objects = FileStorage._FileStorage__objects
+        self.assertNotIn("User." + user.id, objects)
+        self.assertEqual(self.file_storage.count(User),
+                         len(self.file_storage.all(User)))
+        self.assertIn("User." + user.id, objects)
+        self.assertNotIn("BaseModel." + base_model.id, objects)
+
+        reloaded = self.file_storage.get(BaseModel, base_model.id)
+        self.assertIsInstance(reloaded, BaseModel)
+        self.assertIn("BaseModel." + base_model.id, objects)
+
+    def test_lazy_save_keeps_unloaded_objects(self):
+        """Test that save() writes raw entries without building them."""
+        user = User()
+        self.file_storage.save()
+        FileStorage.lazy = True
+        self.file_storage.reload()
+        State().save()
+
+        with open(FileStorage._FileStorage__file_path) as file:
+            self.assertIn("User." + user.id, json.load(file))
+        self.assertIsNotNone(self.file_storage.get("User", user.id))
+
+    def test_stream_reload(self):
+        """Test that the streaming reload builds the same objects."""
+        user = User()
+        user.first_name = "Betty"
+        self.file_storage.save()
+        FileStorage._FileStorage__objects.clear()
+        FileStorage.stream = True
+        self.file_storage.reload()
+        self.assertEqual(self.file_storage.get(User, user.id).first_name,
+                         "Betty")
+
+    def test_stream_reload_corrupted_json(self):
+        """Test that the streaming reload rejects an invalid file."""
+        with open(FileStorage._FileStorage__file_path, 'w') as file:
+            file.write('{"User.1": {"id": "1"')
+        FileStorage.stream = True
+        with self.assertRaises(json.JSONDecodeError):
+            self.file_storage.reload()
+
+    def test_save_is_atomic(self):
+        """Test that a failed save leaves the previous snapshot intact."""
+        user = User()
+        self.file_storage.save()
+        with open(FileStorage._FileStorage__file_path) as file:
+            before = file.read()
+
+        User()
+        with patch("json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.file_storage.save()
+        with open(FileStorage._FileStorage__file_path) as file:
+            self.assertEqual(file.read(), before)
+        self.assertIn("User." + user.id, json.loads(before))
+
+    def test_fsync_policies(self):
+        """Test when each fsync policy syncs the written files."""
+        with patch("os.fsync") as mock_fsync:
+            FileStorage.fsync = "never"
+            User().save()
+            self.assertEqual(mock_fsync.call_count, 0)
+
+            FileStorage.fsync = "always"
+            User().save()
+            self.assertGreaterEqual(mock_fsync.call_count, 1)
+
+            FileStorage.fsync = "periodic"
+            FileStorage.fsync_interval = 3600
+            mock_fsync.reset_mock()
+            User().save()
+            self.assertEqual(mock_fsync.call_count, 0)
+            # The skipped write is synced when the interval is over
+            self.file_storage.sync_pending()
+            self.assertGreaterEqual(mock_fsync.call_count, 1)
+            FileStorage.fsync_interval = 0.05
+            FileStorage._FileStorage__last_fsync = time.monotonic()
+            mock_fsync.reset_mock()
+            User().save()
+            self.assertEqual(mock_fsync.call_count, 0)
+            time.sleep(0.2)
+            self.assertGreaterEqual(mock_fsync.call_count, 1)
+
+            FileStorage.fsync = "sometimes"
+            with self.assertRaises(ValueError):
+                User().save()
+        FileStorage.fsync_interval = 1.0
+
+    def test_async_writes(self):
+        """Test that the background writer persists the saved objects."""
+        FileStorage.async_writes = True
+        user = User()
+        with patch("atexit.register") as register, \
+                patch("atexit.unregister") as unregister:
+            # Started through models.storage, closed through another instance
+            user.save()
+            self.file_storage.close()
+        unregister.assert_called_once_with(*register.call_args.args)
+        with open(FileStorage._FileStorage__file_path) as file:
+            self.assertIn("User." + user.id, json.load(file))
+
+    def test_async_write_errors_are_raised(self):
+        """Test that a failed background write is raised by the next save."""
+        FileStorage.async_writes = True
+        user = User()
+        with patch.object(FileStorage, "compact",
+                          side_effect=OSError("disk full")):
+            user.save()
+            for _ in range(100):
+                if FileStorage._FileStorage__write_error is not None:
+                    break
+                time.sleep(0.01)
+            with self.assertRaises(OSError):
+                user.save()
+        self.file_storage.close()
+        with open(FileStorage._FileStorage__file_path) as file:
+            self.assertIn("User." + user.id, json.load(file))
+
+    def test_async_writes_coalesce(self):
+        """Test that a burst of saves results in few writes."""
+        FileStorage.async_writes = True
+        write_lock = FileStorage._FileStorage__write_lock
+        with patch.object(FileStorage, "compact",
+                          wraps=self.file_storage.compact) as mock_compact:
+            with write_lock:
+                users = [User() for _ in range(20)]
+                for user in users:
+                    user.save()
+            self.file_storage.close()
+        self.assertLessEqual(mock_compact.call_count, 3)
+        with open(FileStorage._FileStorage__file_path) as file:
+            saved = json.load(file)
+        for user in users:
+            self.assertIn("User." + user.id, saved)
+
+    def test_reload_compact_models(self):
+        """Test that compact mode reloads slots-backed instances."""
+        user = User()
+        user.first_name = "Betty"
+        self.file_storage.save()
+        FileStorage.compact_models = True
+        self.file_storage.reload()
+        reloaded = self.file_storage.get(User, user.id)
+        self.assertIsNot(type(reloaded), User)
+        self.assertIsInstance(reloaded, User)
+        self.assertEqual(reloaded.to_dict(), user.to_dict())
+
+        reloaded.last_name = "Holberton"
+        self.assertTrue(self.file_storage.is_dirty(reloaded))
+
+    def test_columns_follow_storage(self):
+        """Test that columns() tracks new, updated and deleted objects."""
+        for obj in list(self.file_storage.all(Place).values()):
+            self.file_storage.delete(obj)
+        cheap = Place()
+        cheap.price_by_night = 40
+        columns = self.file_storage.columns(Place)
+        try:
+            self.assertIs(self.file_storage.columns(Place, ["max_guest"]),
+                          columns)
+            pricey = Place()
+            pricey.price_by_night = 300
+            self.assertEqual(columns.max("price_by_night"), 300)
+            cheap.price_by_night = 60
+            self.assertEqual(columns.min("price_by_night"), 60)
+            self.file_storage.delete(pricey)
+            self.assertEqual(columns.filter(), ["Place." + cheap.id])
+        finally:
+            self.file_storage.remove_index(Place, columns)
+
+    def test_places_near(self):
+        """Test the geospatial queries of storage."""
+        home = Place()
+        home.latitude, home.longitude = 48.8566, 2.3522
+        away = Place()
+        away.latitude, away.longitude = 45.7640, 4.8357
+        near = [place for _, place in
+                self.file_storage.places_near(48.85, 2.35, 10)]
+        self.assertIn(home, near)
+        self.assertNotIn(away, near)
+
+        away.latitude, away.longitude = 48.86, 2.34
+        self.assertIn(away, [place for _, place in
+                             self.file_storage.places_near(48.85, 2.35, 10)])
+        self.file_storage.delete(home)
+        self.assertEqual(
+            self.file_storage.places_in_bbox(48.8, 2.3, 48.9, 2.4), [away])
+        self.file_storage.remove_index(Place, self.file_storage._place_grid())
+
+    def test_where(self):
+        """Test attribute queries with and without an index."""
+        for obj in list(self.file_storage.all(Place).values()):
+            self.file_storage.delete(obj)
+        cheap, roomy = Place(), Place()
+        cheap.price_by_night, cheap.max_guest = 50, 2
+        roomy.price_by_night, roomy.max_guest = 90, 6
+        query = "price_by_night<100, max_guest>=4"
+        self.assertEqual(self.file_storage.where(Place, query), [roomy])
+        self.assertTrue(self.file_storage.where(Place, query, explain=True)
+                        .startswith("full scan of Place (2 objects)"))
+
+        index = self.file_storage.create_index(Place, "max_guest")
+        try:
+            self.assertIs(self.file_storage.create_index(Place, "max_guest"),
+                          index)
+            self.assertTrue(self.file_storage.where(Place, query, explain=True)
+                            .startswith("sorted index on Place.max_guest"))
+            cheap.max_guest = 4
+            self.assertCountEqual(self.file_storage.where(Place, query),
+                                  [cheap, roomy])
+        finally:
+            self.file_storage.remove_index(Place, index)
+        with self.assertRaises(ValueError):
+            self.file_storage.create_index(Place, "name", "btree")
+
+    def test_where_with_other_indexes(self):
+        """Test that grids and column stores are left out of the plan."""
+        place = Place()
+        place.latitude, place.longitude, place.max_guest = 48.85, 2.35, 6
+        grid = self.file_storage._place_grid()
+        columns = self.file_storage.columns(Place)
+        index = self.file_storage.create_index(Place, "max_guest")
+        try:
+            self.assertIn(place, self.file_storage.where(Place, "max_guest>4"))
+            self.assertIn(place,
+                          self.file_storage.where(Place, "latitude>48"))
+        finally:
+            for other in (grid, columns, index):
+                self.file_storage.remove_index(Place, other)
+
+    def shard_contents(self):
+        """Returns {name: content} of the shard files."""
+        shards = {}
+        for name, path in FileStorage._shard_files().items():
+            with open(path) as file:
+                shards[name] = json.load(file)
+        return shards
+
+    def test_sharded_save_rewrites_dirty_shards(self):
+        """Test that a save only rewrites the shards of dirty objects."""
+        FileStorage.sharded = True
+        user, state = User(), State()
+        self.file_storage.save()
+        shards = self.shard_contents()
+        self.assertIn("User." + user.id, shards["User.json"])
+        self.assertIn("State." + state.id, shards["State.json"])
+        self.assertFalse(os.path.exists(FileStorage._FileStorage__file_path))
+
+        with patch.object(self.file_storage, "_write_file",
+                          wraps=self.file_storage._write_file) as mock_write:
+            state.name = "Texas"
+            self.file_storage.save()
+        self.assertEqual(
+            [os.path.basename(call.args[0]) for call in mock_write.mock_calls],
+            ["State.json"])
+
+        self.file_storage.delete(state)
+        self.file_storage.save()
+        shards = self.shard_contents()
+        self.assertNotIn("State." + state.id, shards.get("State.json", {}))
+
+    def test_sharded_reload_by_class(self):
+        """Test that reload() can be limited to some classes."""
+        FileStorage.sharded = True
+        FileStorage.shards_per_class = 4
+        users = [User() for _ in range(20)]
+        state = State()
+        self.file_storage.save()
+        self.assertTrue(all(name.count('.') == 2
+                            for name in FileStorage._shard_files()))
+
+        for key in list(self.file_storage.all()):
+            self.file_storage._untrack(key)
+        self.file_storage._take_dirty()
+        self.file_storage.reload(classes=[State])
+        self.assertIsNotNone(self.file_storage.get(State, state.id))
+        self.assertEqual(self.file_storage.count(User), 0)
+        self.file_storage.reload()
+        for user in users:
+            self.assertIsNotNone(self.file_storage.get(User, user.id))
+
+    def test_sharded_save_serializes_written_shards(self):
+        """Test that only the objects of the rewritten shards are dumped."""
+        FileStorage.sharded = True
+        FileStorage.shards_per_class = 4
+        users = [User() for _ in range(20)]
+        self.file_storage.save()
+        shard = self.file_storage._shard_name("User." + users[0].id)
+        expected = [key.split('.')[1] for key in self.file_storage.all(User)
+                    if self.file_storage._shard_name(key) == shard]
+        users[0].first_name = "Betty"
+        with patch.object(User, "to_dict", autospec=True,
+                          side_effect=User.to_dict) as mock_to_dict:
+            self.file_storage.save()
+        self.assertCountEqual(
+            [call.args[0].id for call in mock_to_dict.mock_calls], expected)
+        self.assertEqual(self.shard_contents()[shard][
+            "User." + users[0].id]["first_name"], "Betty")
+
+    def test_partial_reload_keeps_other_classes(self):
+        """Test that writes after reload(classes) keep the other classes."""
+        for sharded in (True, False):
+            FileStorage.sharded = sharded
+            place, user = Place(), User()
+            self.file_storage.compact()
+            for key in list(self.file_storage.all()):
+                self.file_storage._untrack(key)
+            self.file_storage.reload(classes=[User])
+            self.assertIsNone(self.file_storage.get(Place, place.id))
+
+            new_place = Place()
+            new_place.save()
+            self.file_storage.reload()
+            for obj in (place, new_place, user):
+                self.assertIsNotNone(
+                    self.file_storage.get(type(obj), obj.id))
+
+            for key in list(self.file_storage.all()):
+                self.file_storage._untrack(key)
+            self.file_storage.reload(classes=[User])
+            self.file_storage.delete(self.file_storage.get(User, user.id))
+            self.file_storage.convert("pickle")
+            FileStorage.serializer = "json"
+            self.file_storage.reload()
+            self.assertIsNotNone(self.file_storage.get(Place, place.id))
+            self.assertIsNone(self.file_storage.get(User, user.id))
+            if sharded:
+                self.assertIn("Place.json", FileStorage._shard_files())
+
+    def test_sharded_layout_change(self):
+        """Test moving from file.json to shards and between shard counts."""
+        user = User()
+        self.file_storage.save()
+        FileStorage.sharded = True
+        self.file_storage.reload()
+        User().save()
+        self.assertIn("User." + user.id, self.shard_contents()["User.json"])
+
+        FileStorage.shards_per_class = 2
+        self.file_storage.reload()
+        User().save()
+        shards = self.shard_contents()
+        self.assertNotIn("User.json", shards)
+        self.assertEqual(sum("User." + user.id in objects
+                             for objects in shards.values()), 1)
+
+    def test_sharded_reload_in_processes(self):
+        """Test that shards parsed in worker processes reload the same."""
+        FileStorage.sharded = True
+        FileStorage.shards_per_class = 3
+        users = [User() for _ in range(10)]
+        places = [Place() for _ in range(10)]
+        self.file_storage.save()
+        expected = {obj.id: obj.to_dict() for obj in users + places}
+
+        for key in list(self.file_storage.all()):
+            self.file_storage._untrack(key)
+        FileStorage.reload_processes = 2
+        self.file_storage.reload()
+        for obj_id, value in expected.items():
+            reloaded = self.file_storage.get(value["__class__"], obj_id)
+            self.assertEqual(reloaded.to_dict(), value)
+
+    def test_import_with_reload_processes(self):
+        """Test that importing models with worker processes set loads."""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))
+        env = dict(os.environ, PYTHONPATH=root, HBNB_STORAGE_SHARDED="1",
+                   HBNB_STORAGE_SHARDS="3")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        with tempfile.TemporaryDirectory() as directory:
+            subprocess.run(
+                [sys.executable, "-c",
+                 "from models import storage\n"
+                 "from models.user import User\n"
+                 "users = [User() for _ in range(10)]\n"
+                 "storage.save()"],
+                cwd=directory, env=env, check=True, timeout=60)
+            env["HBNB_STORAGE_RELOAD_PROCESSES"] = "2"
+            result = subprocess.run(
+                [sys.executable, "-c",
+                 "from models import storage\n"
+                 "print(storage.count('User'))"],
+                cwd=directory, env=env, check=True, timeout=60,
+                stdout=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(result.stdout.strip(), "10")
+
+    def test_convert_formats(self):
+        """Test that convert() rewrites the store and reload() detects it."""
+        path = FileStorage._FileStorage__file_path
+        user = User()
+        user.first_name = "Betty"
+        self.file_storage.save()
+        self.file_storage.convert("pickle")
+        with open(path, "rb") as file:
+            self.assertEqual(file.readline(), b"HBNB/pickle/1\n")
+
+        for key in list(self.file_storage.all()):
+            self.file_storage._untrack(key)
+        FileStorage.serializer = "json"
+        self.file_storage.reload()
+        self.assertEqual(self.file_storage.get(User, user.id).first_name,
+                         "Betty")
+
+        FileStorage.sharded = True
+        self.file_storage.convert("pickle")
+        self.file_storage.reload(classes=[User])
+        self.assertIsNotNone(self.file_storage.get(User, user.id))
+        self.file_storage.convert("json")
+        self.assertIn("User." + user.id, self.shard_contents()["User.json"])
+        with self.assertRaises(ValueError):
+            self.file_storage.convert("xml")
+        self.assertEqual(FileStorage.serializer, "json")
+
+    def test_compressed_snapshot(self):
+        """Test gzip snapshots chosen by config or by file extension."""
+        path = FileStorage._FileStorage__file_path
+        user = User()
+        FileStorage.compression = "gzip"
+        self.file_storage.save()
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(2), b"\x1f\x8b")
+        FileStorage.compression = None
+        FileStorage.stream = True
+        self.file_storage.reload()
+        self.assertIsNotNone(self.file_storage.get(User, user.id))
+
+        FileStorage._FileStorage__file_path = path + ".xz"
+        try:
+            self.file_storage.compact()
+            with open(path + ".xz", "rb") as file:
+                self.assertEqual(file.read(6), b"\xfd7zXZ\x00")
+        finally:
+            FileStorage._FileStorage__file_path = path
+            os.remove(path + ".xz")
+
+    def test_compressed_shards(self):
+        """Test that changing the compression renames every shard."""
+        FileStorage.sharded = True
+        user = User()
+        State()
+        self.file_storage.save()
+        FileStorage.compression = "lzma"
+        self.file_storage.reload()
+        User().save()
+        names = FileStorage._shard_files()
+        self.assertIn("State.json.xz", names)
+        self.assertTrue(all(name.endswith(".json.xz") for name in names))
+        for key in list(self.file_storage.all()):
+            self.file_storage._untrack(key)
+        self.file_storage.reload(classes=[User])
+        self.assertIsNotNone(self.file_storage.get(User, user.id))
+
+    def test_lazy_indexed_snapshot(self):
+        """Test that lazy reload maps an indexed snapshot."""
+        users = [User() for _ in range(5)]
+        users[0].first_name = "Betty"
+        FileStorage.serializer = "indexed"
+        self.file_storage.compact()
+        FileStorage.lazy = True
+        self.file_storage.reload()
+
+        objects = FileStorage._FileStorage__objects
+        count = self.file_storage.count(User)
+        with patch("models.engine.mmap_snapshot.MappedSnapshot.value",
+                   autospec=True,
+                   side_effect=MappedSnapshot.value) as mock_value:
+            reloaded = self.file_storage.get(User, users[0].id)
+        self.assertEqual(mock_value.call_count, 1)
+        self.assertEqual(reloaded.first_name, "Betty")
+        self.assertNotIn("User." + users[1].id, objects)
+        self.assertEqual(self.file_storage.count(User), count)
+
+        self.file_storage.delete(self.file_storage.get(User, users[1].id))
+        self.file_storage.save()
+        FileStorage.lazy = False
+        self.file_storage.reload()
+        self.assertEqual(self.file_storage.count(User), count - 1)
+        self.assertIsNone(self.file_storage.get(User, users[1].id))
+        self.assertIsNotNone(self.file_storage.get(User, users[2].id))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the GridIndex class.
+"""
+
+import unittest
+import random
+from types import SimpleNamespace
+from models.engine.geo_index import GridIndex, haversine_km
+from models.place import Place
+
+
+def place_at(latitude, longitude):
+    """Return a place with the given coordinates."""
+    place = Place()
+    place.latitude = latitude
+    place.longitude = longitude
+    return place
+
+
+class TestGridIndex(unittest.TestCase):
+    """Test cases for the GridIndex class."""
+
+    def setUp(self):
+        """Index a few known places."""
+        self.index = GridIndex(cell_size=0.5)
+        self.places = {
+            "sf": place_at(37.7749, -122.4194),
+            "oakland": place_at(37.8044, -122.2712),
+            "la": place_at(34.0522, -118.2437),
+            "fiji": place_at(-17.7134, 178.0650),
+            "samoa": place_at(-13.7590, -172.1046),
+        }
+        for key, place in self.places.items():
+            self.index.add(key, place)
+
+    def test_haversine(self):
+        """Test the distance between San Francisco and Los Angeles."""
+        self.assertAlmostEqual(
+            haversine_km(37.7749, -122.4194, 34.0522, -118.2437), 559, delta=2)
+
+    def test_near(self):
+        """Test radius queries, nearest first."""
+        found = self.index.near(37.7749, -122.4194, 20)
+        self.assertEqual([key for _, key in found], ["sf", "oakland"])
+        self.assertEqual(found[0][0], 0)
+        self.assertEqual(len(self.index.near(37.7749, -122.4194, 600)), 3)
+        self.assertEqual(len(self.index.near(0, 0, 30000)), 5)
+
+    def test_within(self):
+        """Test bounding boxes, including one across the antimeridian."""
+        self.assertEqual(set(self.index.within(33, -123, 38, -118)),
+                         {"sf", "oakland", "la"})
+        self.assertEqual(set(self.index.within(-20, 170, -10, -170)),
+                         {"fiji", "samoa"})
+
+    def test_update_and_remove(self):
+        """Test that moved and removed places are reindexed."""
+        la = self.places["la"]
+        la.latitude = 37.78
+        la.longitude = -122.40
+        self.index.update("la", la, "longitude")
+        self.assertIn("la", [key for _, key in
+                             self.index.near(37.7749, -122.4194, 5)])
+        self.index.update("la", la, "name")
+        self.index.remove("sf")
+        self.assertEqual(len(self.index), 4)
+        self.assertNotIn("sf", self.index.within(-90, -180, 90, 180))
+
+    def test_invalid_coordinates(self):
+        """Test that unusable coordinates are not indexed."""
+        self.index.add("nowhere", place_at("north", 0))
+        self.index.add("beyond", place_at(95, 0))
+        self.assertEqual(len(self.index), 5)
+
+    def test_cell_size_not_dividing_360(self):
+        """Test queries against a scan with cells that do not tile 360."""
+        random.seed(0)
+        index = GridIndex(cell_size=7)
+        points = {i: SimpleNamespace(latitude=random.uniform(-90, 90),
+                                     longitude=random.uniform(-180, 180))
+                  for i in range(300)}
+        for key, point in points.items():
+            index.add(key, point)
+        for _ in range(300):
+            south = random.uniform(-90, 80)
+            west, east = random.uniform(-180, 180), random.uniform(-180, 180)
+            north = south + random.uniform(0, 30)
+            crosses = west > east
+            self.assertCountEqual(index.within(south, west, north, east), [
+                key for key, point in points.items()
+                if south <= point.latitude <= north and
+                ((west <= point.longitude or point.longitude <= east)
+                 if crosses else west <= point.longitude <= east)])
+            lat, lon = random.uniform(-80, 80), random.uniform(-180, 180)
+            self.assertCountEqual(
+                [key for _, key in index.near(lat, lon, 1000)],
+                [key for key, point in points.items()
+                 if haversine_km(lat, lon, point.latitude,
+                                 point.longitude) <= 1000])
+
+
+if __name__ == '__main__':
+    unittest.main()
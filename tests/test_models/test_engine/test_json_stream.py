@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the json_stream module.
+"""
+
+import unittest
+import json
+from io import StringIO
+from models.engine.json_stream import iter_items
+
+
+class TestIterItems(unittest.TestCase):
+    """Test cases for iter_items."""
+
+    def parse(self, text, chunk_size=3):
+        """Parse text with a small chunk size to cross chunk borders."""
+        return list(iter_items(StringIO(text), chunk_size=chunk_size))
+
+    def test_matches_json_load(self):
+        """Test that the pairs match the document loaded at once."""
+        document = {
+            "User.1": {"id": "1", "email": "a@b.c", "tags": [1, 2.5, None]},
+            "Place.2": {"id": "2", "price_by_night": 12345, "ok": True},
+            "Review.3": {"id": "3", "text": "say \"hi\" {, }"},
+        }
+        text = json.dumps(document, indent=2)
+        for chunk_size in (1, 2, 7, 64, 1 << 16):
+            self.assertEqual(dict(self.parse(text, chunk_size)), document)
+
+    def test_numbers_split_across_chunks(self):
+        """Test that a number cut by a chunk border is read whole."""
+        self.assertEqual(self.parse('{"a": 123456789}', chunk_size=9),
+                         [("a", 123456789)])
+
+    def test_scalars_split_after_a_valid_prefix(self):
+        """Test numbers whose first chunk is a number on its own."""
+        for text, value in (('{"a": 1.5e10 }', 1.5e10),
+                            ('{"a": -0.25}', -0.25),
+                            ('{"a": 12e-3, "b": 1}', 12e-3)):
+            for chunk_size in range(1, len(text) + 1):
+                self.assertEqual(self.parse(text, chunk_size)[0], ("a", value),
+                                 msg=(text, chunk_size))
+
+    def test_empty_object(self):
+        """Test an empty document."""
+        self.assertEqual(self.parse(" { } "), [])
+
+    def test_invalid_documents(self):
+        """Test that malformed documents raise JSONDecodeError."""
+        for text in ("invalid_json", "", "[1, 2]", '{"a": 1', '{"a" 1}',
+                     '{"a": 1,}', '{"a": 1} x', '{1: 2}'):
+            with self.assertRaises(json.JSONDecodeError, msg=text):
+                self.parse(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the MappedSnapshot class.
+"""
+
+import os
+import tempfile
+import unittest
+from models.engine import serializers
+from models.engine.mmap_snapshot import MappedSnapshot
+
+OBJECTS = {
+    "{}.{}".format(cls, i): {"__class__": cls, "id": str(i), "number": i}
+    for cls in ("Amenity", "City", "User", "UserProfile")
+    for i in range(25)
+}
+
+
+class TestMappedSnapshot(unittest.TestCase):
+    """Test cases for the MappedSnapshot class."""
+
+    def setUp(self):
+        """Write OBJECTS to an indexed snapshot."""
+        descriptor, self.path = tempfile.mkstemp()
+        with os.fdopen(descriptor, "wb") as file:
+            serializers.get("indexed").dump(OBJECTS, file)
+        self.snapshot = MappedSnapshot(self.path)
+
+    def tearDown(self):
+        """Remove the snapshot."""
+        os.remove(self.path)
+
+    def test_get(self):
+        """Test lookups by key."""
+        self.assertEqual(len(self.snapshot), len(OBJECTS))
+        for key, value in OBJECTS.items():
+            self.assertEqual(self.snapshot.get(key), value)
+        for key in ("User.250", "User.", "Users.1", "", "Zebra.1"):
+            self.assertIsNone(self.snapshot.get(key), key)
+
+    def test_classes_and_ranges(self):
+        """Test that class prefixes do not overlap."""
+        self.assertEqual(self.snapshot.classes(),
+                         ["Amenity", "City", "User", "UserProfile"])
+        start, stop = self.snapshot.range("User.")
+        self.assertEqual(stop - start, 25)
+        self.assertEqual(len(self.snapshot.view("Place")), 0)
+
+    def test_view_mutations(self):
+        """Test that views hide deleted keys and keep new values."""
+        view = self.snapshot.view("City")
+        self.assertEqual(sorted(view), sorted(
+            key for key in OBJECTS if key.startswith("City.")))
+        self.assertEqual(view.pop("City.3"), OBJECTS["City.3"])
+        self.assertNotIn("City.3", view)
+        view["City.4"] = {"id": "4"}
+        view["City.new"] = {"id": "new"}
+        self.assertEqual(view["City.4"], {"id": "4"})
+        self.assertEqual(len(view), 25)
+        del view["City.4"]
+        self.assertNotIn("City.4", view)
+        self.assertEqual(len(view), 24)
+        with self.assertRaises(KeyError):
+            del view["City.3"]
+
+    def test_invalid_file(self):
+        """Test that other formats are rejected."""
+        with open(self.path, "wb") as file:
+            file.write(b'{"User.1": {}}')
+        with self.assertRaises(ValueError):
+            MappedSnapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
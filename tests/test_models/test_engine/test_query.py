@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the query module.
+"""
+
+import unittest
+from models.engine.query import (Condition, SortedIndex, describe,
+                                 parse_conditions, plan, select)
+from models.engine.relation_index import RelationIndex
+from models.place import Place
+
+
+class TestParseConditions(unittest.TestCase):
+    """Test cases for parse_conditions."""
+
+    def test_parse(self):
+        """Test operators and value types."""
+        self.assertEqual(
+            parse_conditions('price_by_night<100, max_guest >= 4, '
+                             'name="Loft, SF", city_id=abc, latitude!=1.5'),
+            [Condition("price_by_night", "<", 100),
+             Condition("max_guest", ">=", 4),
+             Condition("name", "=", "Loft, SF"),
+             Condition("city_id", "=", "abc"),
+             Condition("latitude", "!=", 1.5)])
+        self.assertEqual(parse_conditions(""), [])
+
+    def test_invalid(self):
+        """Test that malformed conditions raise ValueError."""
+        for text in ("price_by_night", "price_by_night<", "<3", "a<1,,b>2"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_conditions(text)
+
+
+class TestPlanner(unittest.TestCase):
+    """Test cases for SortedIndex and the planner."""
+
+    def setUp(self):
+        """Index a few places by price and by city."""
+        self.objects = {}
+        self.prices = SortedIndex("price_by_night")
+        self.cities = RelationIndex("city_id")
+        for i, price in enumerate((40, 80, 80, 120, 300)):
+            place = Place()
+            place.price_by_night = price
+            place.city_id = "city-{}".format(i % 2)
+            key = "Place." + place.id
+            self.objects[key] = place
+            self.prices.add(key, place)
+            self.cities.add(key, place)
+        self.by_price = sorted(self.objects.values(),
+                               key=lambda place: place.price_by_night)
+
+    def prices_of(self, places):
+        """Return the sorted prices of places."""
+        return sorted(place.price_by_night for place in places)
+
+    def test_sorted_index_ranges(self):
+        """Test every operator against the sorted index."""
+        expected = {"<": [40], "<=": [40, 80, 80], "=": [80, 80],
+                    "==": [80, 80], ">": [120, 300], ">=": [80, 80, 120, 300]}
+        for op, prices in expected.items():
+            condition = Condition("price_by_night", op, 80)
+            keys = self.prices.keys(condition)
+            self.assertEqual(
+                self.prices_of(self.objects[key] for key in keys), prices, op)
+
+    def test_sorted_index_follows_updates(self):
+        """Test that updated and removed keys are reindexed."""
+        place = self.by_price[0]
+        place.price_by_night = 1000
+        key = "Place." + place.id
+        self.prices.update(key, place, "price_by_night")
+        self.assertEqual(
+            self.prices.keys(Condition("price_by_night", ">", 500)), [key])
+        self.prices.remove(key)
+        self.assertEqual(len(self.prices), 4)
+
+    def test_plan_prefers_hash_index(self):
+        """Test the choice of index."""
+        conditions = parse_conditions("price_by_night<100, city_id=city-0")
+        indexes = [self.prices, self.cities]
+        self.assertEqual(plan(conditions, indexes),
+                         (self.cities, conditions[1]))
+        self.assertEqual(plan(conditions[:1], indexes),
+                         (self.prices, conditions[0]))
+        self.assertIsNone(plan(parse_conditions("price_by_night!=1"), indexes))
+        self.assertIsNone(plan(conditions, []))
+
+    def test_select_matches_scan(self):
+        """Test that index and scan plans return the same objects."""
+        for text in ("price_by_night<100, city_id=city-0",
+                     "price_by_night>=80", "city_id=city-1",
+                     "price_by_night=80, price_by_night>=80"):
+            conditions = parse_conditions(text)
+            chosen = plan(conditions, [self.prices, self.cities])
+            self.assertIsNotNone(chosen)
+            self.assertCountEqual(select(self.objects, conditions, chosen),
+                                  select(self.objects, conditions, None), text)
+
+    def test_select_bools_and_nan(self):
+        """Test that bools and NaN give the same result as a scan."""
+        guests = SortedIndex("max_guest")
+        for i, value in enumerate((True, False, float("nan"), 2, 5)):
+            place = self.by_price[i]
+            place.max_guest = value
+            guests.add("Place." + place.id, place)
+        for text in ("max_guest<3", "max_guest>=1", "max_guest=1",
+                     "max_guest=true", "max_guest>0.5, max_guest<=2"):
+            conditions = parse_conditions(text)
+            chosen = plan(conditions, [guests])
+            self.assertIsNotNone(chosen)
+            self.assertCountEqual(select(self.objects, conditions, chosen),
+                                  select(self.objects, conditions, None), text)
+        self.assertIsNone(plan([Condition("max_guest", "<", float("nan"))],
+                               [guests]))
+
+    def test_select_rechecks_index_condition(self):
+        """Test that a stale index entry does not leak into the result."""
+        conditions = parse_conditions("price_by_night<100")
+        chosen = plan(conditions, [self.prices])
+        self.by_price[0].price_by_night = 500
+        self.assertEqual(self.prices_of(select(self.objects, conditions,
+                                               chosen)), [80, 80])
+
+    def test_describe(self):
+        """Test the explain output."""
+        conditions = parse_conditions("price_by_night<100, max_guest>=4")
+        self.assertEqual(
+            describe("Place", conditions, None, 5),
+            "full scan of Place (5 objects), then filter on "
+            "price_by_night < 100 and max_guest >= 4")
+        self.assertEqual(
+            describe("Place", conditions, plan(conditions, [self.prices]), 5),
+            "sorted index on Place.price_by_night for price_by_night < 100, "
+            "then filter on max_guest >= 4")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the RelationIndex class.
+"""
+
+import unittest
+from models.engine.relation_index import RelationIndex
+from models.review import Review
+
+
+class TestRelationIndex(unittest.TestCase):
+    """Test cases for the RelationIndex class."""
+
+    def setUp(self):
+        """Index two reviews of the same place."""
+        self.index = RelationIndex("place_id")
+        self.first = Review()
+        self.first.place_id = "place-1"
+        self.second = Review()
+        self.second.place_id = "place-1"
+        self.index.add("first", self.first)
+        self.index.add("second", self.second)
+
+    def test_keys(self):
+        """Test lookups by value."""
+        self.assertEqual(self.index.keys("place-1"), {"first", "second"})
+        self.assertEqual(self.index.keys("place-2"), set())
+
+    def test_update(self):
+        """Test that only changes of the attribute move a key."""
+        self.first.place_id = "place-2"
+        self.index.update("first", self.first, "text")
+        self.assertIn("first", self.index.keys("place-1"))
+        self.index.update("first", self.first, "place_id")
+        self.assertEqual(self.index.keys("place-1"), {"second"})
+        self.assertEqual(self.index.keys("place-2"), {"first"})
+
+    def test_remove(self):
+        """Test that removed keys disappear."""
+        self.index.remove("first")
+        self.index.remove("second")
+        self.index.remove("unknown")
+        self.assertEqual(self.index.keys("place-1"), set())
+
+    def test_unhashable_value(self):
+        """Test that unhashable values are skipped."""
+        self.first.place_id = ["place-1"]
+        self.index.update("first", self.first)
+        self.assertEqual(self.index.keys("place-1"), {"second"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Contains the unit test cases for the serializers module.
+"""
+
+import io
+import unittest
+from unittest.mock import patch
+from models.engine import serializers
+
+OBJECTS = {
+    "Place.1": {"__class__": "Place", "id": "1", "name": "Loft",
+                "price_by_night": 120, "latitude": 37.77,
+                "amenity_ids": ["a", "b"]},
+    "User.2": {"__class__": "User", "id": "2", "email": "é@hbnb.io"},
+}
+
+
+def dump(name):
+    """Returns a buffered reader over OBJECTS written in format name."""
+    buffer = io.BytesIO()
+    serializers.get(name).dump(OBJECTS, buffer)
+    return io.BufferedReader(io.BytesIO(buffer.getvalue()))
+
+
+class TestSerializers(unittest.TestCase):
+    """Test cases for the storage file formats."""
+
+    def test_round_trip(self):
+        """Test that every format reads back what it wrote."""
+        for name in serializers.SERIALIZERS:
+            self.assertEqual(serializers.load(dump(name)), OBJECTS, name)
+
+    def test_headers(self):
+        """Test that only binary formats write a header."""
+        self.assertEqual(dump("json").read(1), b"{")
+        self.assertEqual(dump("orjson").read(1), b"{")
+        self.assertEqual(dump("pickle").readline(), b"HBNB/pickle/1\n")
+        self.assertIs(serializers.detect(dump("pickle")),
+                      serializers.get("pickle"))
+
+    def test_orjson_fallback(self):
+        """Test that the orjson format works without the package."""
+        with patch.object(serializers, "orjson", None):
+            file = dump("orjson")
+            self.assertEqual(serializers.load(file), OBJECTS)
+
+    def test_unknown_formats(self):
+        """Test that unknown names and headers raise ValueError."""
+        with self.assertRaises(ValueError):
+            serializers.get("xml")
+        for data in (b"HBNB/xml/1\n", b"HBNB/pickle/9\n"):
+            with self.assertRaises(ValueError):
+                serializers.load(io.BufferedReader(io.BytesIO(data)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ Contains the unit test cases for the Place class.
 
 import unittest
 from models.place import Place
+from models.review import Review
 from models.base_model import BaseModel
 
 
@@ -140,6 +141,14 @@ class TestPlace(unittest.TestCase):
         self.assertTrue(hasattr(place, 'custom_attribute'))
         self.assertEqual(place.custom_attribute, "custom_value")
 
+    def test_reviews(self):
+        """Test that reviews lists the reviews of the place."""
+        place = Place()
+        review = Review()
+        review.place_id = place.id
+        self.assertEqual(place.reviews, [review])
+        self.assertNotIn("reviews", place.to_dict())
+
 
 if __name__ == '__main__':
     unittest.main()
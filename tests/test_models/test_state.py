@@ -4,7 +4,9 @@ Contains the unit test cases for the State class.
 """
 
 import unittest
+import models
 from models.state import State
+from models.city import City
 from models.base_model import BaseModel
 
 
@@ -61,6 +63,20 @@ class TestState(unittest.TestCase):
         self.assertTrue(hasattr(state, 'custom_attribute'))
         self.assertEqual(state.custom_attribute, "custom_value")
 
+    def test_cities(self):
+        """Test that cities lists the cities of the state."""
+        state = State()
+        city = City()
+        city.state_id = state.id
+        other = City()
+        self.assertEqual(state.cities, [city])
+        other.state_id = state.id
+        self.assertCountEqual(state.cities, [city, other])
+        city.state_id = "elsewhere"
+        self.assertEqual(state.cities, [other])
+        models.storage.delete(other)
+        self.assertEqual(state.cities, [])
+
 
 if __name__ == '__main__':
     unittest.main()
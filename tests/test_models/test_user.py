@@ -5,6 +5,8 @@ Contains the unit test cases for the User class.
 
 import unittest
 from models.user import User
+from models.place import Place
+from models.review import Review
 from models.base_model import BaseModel
 
 
@@ -109,6 +111,16 @@ class TestUser(unittest.TestCase):
         self.assertEqual(user.first_name, "")
         self.assertEqual(user.last_name, "")
 
+    def test_places_and_reviews(self):
+        """Test that places and reviews list what the user owns."""
+        user = User()
+        place = Place()
+        place.user_id = user.id
+        review = Review()
+        review.user_id = user.id
+        self.assertEqual(user.places, [place])
+        self.assertEqual(user.reviews, [review])
+
 
 if __name__ == '__main__':
     unittest.main()